@@ -13,14 +13,22 @@ This agent demonstrates:
 4. Integration of multiple AI techniques
 """
 
-from typing import Dict, List, Any
+import functools
+import heapq
+from typing import Dict, FrozenSet, List, Any, Tuple, Union
+
+import numpy as np
+
 from modules import (
     bed_allocation,
+    geometry,
     scheduling_csp,
     expert_system,
     fuzzy_triage,
     genetic_optimizer,
+    soa,
 )
+from modules._layout import pack_locations
 
 
 class HospitalAgent:
@@ -34,20 +42,32 @@ class HospitalAgent:
     - Genetic algorithms for resource optimization
     """
     
-    def __init__(self, beds: List[Dict], staff: List[Dict], rules: List[Dict]):
+    def __init__(self, beds: Union[List[Dict], soa.Beds], staff: List[Dict], rules: List[Dict]):
         """Initialize the hospital agent with environment state.
         
         Args:
-            beds: List of bed resources with attributes (id, icu, vent, location, etc.)
+            beds: List of bed resources with attributes (id, icu, vent, location, etc.),
+                or a soa.Beds container. Occupancy is tracked in the agent's
+                BedPool, so beds should be occupied through act().
             staff: List of staff with roles and availability
             rules: Medical knowledge base rules for expert system
         """
-        self.beds = beds
+        self.bed_pool = soa.as_beds(beds, bed_allocation.BedPool)
+        self.beds = self.bed_pool.beds
         self.staff = staff
         self.expert_system = expert_system.ExpertSystem(rules)
+        # Triage only depends on the vitals, so repeat presentations are
+        # served from a per-agent cache. Diagnoses are not cached here: the
+        # expert system memoizes closures itself and drops them on add_rule().
+        self._priority_cached = functools.lru_cache(maxsize=1024)(fuzzy_triage.compute_priority)
         
-        # Agent state
-        self.patients_queue = []
+        # Agent state: priority queue of (-priority, arrival, perception)
+        self._pq = []
+        self._counter = 0
+        # GA state kept between decisions to warm-start the next run
+        self._ga_pop = None
+        self._ga_keys = []
+        self._rng = np.random.default_rng()
         self.scheduled_surgeries = []
         self.allocated_beds = {}
         
@@ -60,20 +80,13 @@ class HospitalAgent:
         Returns:
             Processed perception with priority and medical assessment
         """
-        # Use fuzzy logic to compute patient priority
-        priority = fuzzy_triage.compute_priority(
-            patient_data.get('temp', 37.0),
-            patient_data.get('sbp', 120),
-            patient_data.get('pain', 0)
+        priority, diagnosis = self._perceive_pure(
+            float(patient_data.get('temp', 37.0)),
+            float(patient_data.get('sbp', 120)),
+            float(patient_data.get('pain', 0)),
+            frozenset(patient_data.get('symptoms', [])),
         )
         
-        # Use expert system for medical assessment
-        for symptom in patient_data.get('symptoms', []):
-            self.expert_system.assert_fact(symptom)
-        self.expert_system.infer()
-        
-        diagnosis = list(self.expert_system.facts)
-        
         return {
             'patient_id': patient_data.get('id'),
             'priority': priority,
@@ -83,6 +96,21 @@ class HospitalAgent:
             'location': patient_data.get('location', (0, 0))
         }
     
+    def _perceive_pure(self, temp: float, sbp: float, pain: float,
+                       symptoms: FrozenSet[str]) -> Tuple[float, Tuple[str, ...]]:
+        """Priority and diagnosis for one set of vitals and symptoms.
+        
+        Diagnosis is the closure of the symptoms under the agent's rules,
+        computed without touching the shared fact base, so facts from
+        earlier patients never leak into this diagnosis.
+        """
+        # Use fuzzy logic to compute patient priority
+        priority = self._priority_cached(temp, sbp, pain)
+        
+        # Use expert system for medical assessment
+        diagnosis = self.expert_system.sorted_closure(symptoms)
+        return priority, diagnosis
+    
     def decide(self, perception: Dict) -> Dict[str, Any]:
         """Goal-based reasoning: Decide on actions based on perception.
         
@@ -93,31 +121,139 @@ class HospitalAgent:
             Decision with bed allocation and scheduling recommendations
         """
         # Goal 1: Allocate appropriate bed using A* search
-        bed = bed_allocation.allocate_bed(perception, self.beds)
+        bed_idx = self.bed_pool.select(perception)
+        bed = self.beds[bed_idx] if bed_idx >= 0 else None
         
         # Goal 2: Prioritize patient in queue
-        self.patients_queue.append(perception)
-        self.patients_queue.sort(key=lambda p: p['priority'], reverse=True)
+        entry = (-perception['priority'], self._counter, perception)
+        heapq.heappush(self._pq, entry)
+        self._counter += 1
         
         # Goal 3: Optimize resource allocation using GA if queue is large
-        if len(self.patients_queue) > 5:
-            optimal_allocation = genetic_optimizer.ga_optimize(
-                self.patients_queue[:10], 
-                self.beds,
-                pop_size=30,
-                gens=20
+        if len(self._pq) > 5:
+            optimal_allocation = self._optimize_queue(
+                [p for _, _, p in heapq.nsmallest(10, self._pq)]
             )
         else:
             optimal_allocation = None
         
         return {
             'allocated_bed': bed,
-            'queue_position': self.patients_queue.index(perception),
+            'bed_index': bed_idx,
+            'queue_position': self.queue_position(entry),
             'priority': perception['priority'],
             'diagnosis': perception['diagnosis'],
             'optimal_allocation': optimal_allocation
         }
     
+    def decide_batch(self, perceptions: List[Dict]) -> List[Dict[str, Any]]:
+        """Decide for several patients at once.
+        
+        Patient-to-bed distances are computed once with
+        geometry.pairwise_manhattan and shared by bed allocation and the GA.
+        Like decide(), this does not occupy beds; act() does. The GA runs
+        once after the whole batch is queued, and every decision carries
+        that result.
+        
+        Args:
+            perceptions: Processed patient information, in arrival order
+            
+        Returns:
+            One decision per perception, in the same order
+        """
+        pool = self.bed_pool
+        positions = []
+        for perception in perceptions:
+            entry = (-perception['priority'], self._counter, perception)
+            heapq.heappush(self._pq, entry)
+            self._counter += 1
+            positions.append(self.queue_position(entry))
+        
+        ga_patients = [p for _, _, p in heapq.nsmallest(10, self._pq)] if len(self._pq) > 5 else []
+        # one distance matrix over the batch plus any GA patients queued earlier
+        batch_ids = {id(p) for p in perceptions}
+        patients = list(perceptions) + [p for p in ga_patients if id(p) not in batch_ids]
+        row = {id(p): i for i, p in enumerate(patients)}
+        dist = geometry.pairwise_manhattan(pack_locations(patients), pool.xy)
+        
+        if ga_patients:
+            optimal_allocation = self._optimize_queue(
+                ga_patients,
+                dist=dist[[row[id(p)] for p in ga_patients]]
+            )
+        else:
+            optimal_allocation = None
+        
+        decisions = []
+        for i, perception in enumerate(perceptions):
+            bed_idx = pool.select(perception, dist=dist[i])
+            decisions.append({
+                'allocated_bed': pool.beds[bed_idx] if bed_idx >= 0 else None,
+                'bed_index': bed_idx,
+                'queue_position': positions[i],
+                'priority': perception['priority'],
+                'diagnosis': perception['diagnosis'],
+                'optimal_allocation': optimal_allocation
+            })
+        return decisions
+    
+    def _optimize_queue(self, patients: List[Dict], dist: np.ndarray = None) -> List[int]:
+        """Run the GA over `patients`, warm-started from the previous run.
+        
+        The queue head changes by about one patient between decisions, so the
+        last final population is reused and only a few generations are run.
+        """
+        warm = self._warm_population(patients)
+        best, self._ga_pop = genetic_optimizer.ga_evolve(
+            patients,
+            self.bed_pool,
+            pop_size=30,
+            gens=20 if warm is None else 5,
+            dist=dist,
+            warm_pop=warm
+        )
+        self._ga_keys = [self._patient_key(p) for p in patients]
+        return best
+    
+    @staticmethod
+    def _patient_key(patient: Dict) -> Any:
+        """Stable identity of a queued patient across decisions."""
+        key = patient.get('patient_id', patient.get('id'))
+        # anonymous patients can only be told apart by object identity
+        return ('obj', id(patient)) if key is None else key
+    
+    def _warm_population(self, patients: List[Dict]):
+        """Re-index the previous GA population onto `patients`, or None."""
+        if self._ga_pop is None or not len(self._ga_pop):
+            return None
+        prev = {key: j for j, key in enumerate(self._ga_keys)}
+        cols = [prev.get(self._patient_key(p)) for p in patients]
+        if all(c is None for c in cols):
+            return None
+        pool = self.bed_pool
+        pop = np.empty((len(self._ga_pop), len(patients)), dtype=np.int16)
+        for i, (patient, col) in enumerate(zip(patients, cols)):
+            if col is not None:
+                pop[:, i] = self._ga_pop[:, col]
+            else:
+                # new patient: random genes, with the greedy bed in the best row
+                pop[:, i] = self._rng.integers(-1, len(self.beds), size=len(pop))
+                pop[0, i] = pool.select(patient)
+        return pop
+    
+    def ordered_queue(self) -> List[Dict]:
+        """Return queued perceptions, highest priority first (ties by arrival)."""
+        return [p for _, _, p in sorted(self._pq)]
+    
+    @property
+    def patients_queue(self) -> List[Dict]:
+        return self.ordered_queue()
+    
+    def queue_position(self, entry: tuple) -> int:
+        """Rank of a queue entry without materializing the ordered queue."""
+        key = entry[:2]
+        return sum(1 for e in self._pq if e[:2] < key)
+    
     def act(self, decision: Dict) -> str:
         """Actuators: Execute the decision.
         
@@ -128,9 +264,17 @@ class HospitalAgent:
             Action report string
         """
         bed = decision['allocated_bed']
+        idx = decision.get('bed_index')
+        if bed and idx is None:
+            # decisions built by hand may carry a copy of the bed dict
+            idx = next((i for i, b in enumerate(self.beds) if b is bed), None)
+            if idx is None:
+                idx = next((i for i, b in enumerate(self.beds) if b.get('id') == bed.get('id')), None)
+            # a bed that is not one of this agent's is reported as no bed
+            bed = self.beds[idx] if idx is not None else None
         if bed:
             self.allocated_beds[decision.get('patient_id', 'unknown')] = bed
-            bed['is_occupied'] = True
+            self.bed_pool.mark_occupied(idx)
             action = f"Allocated bed {bed['id']} (Priority: {decision['priority']:.1f})"
         else:
             action = f"No bed available. Queue position: {decision['queue_position']}"
@@ -161,14 +305,14 @@ class HospitalAgent:
         Returns:
             Status dictionary with metrics
         """
-        occupied_beds = sum(1 for b in self.beds if b.get('is_occupied', False))
+        occupied_beds = int(self.bed_pool.occupied.sum())
         return {
             'total_beds': len(self.beds),
             'occupied_beds': occupied_beds,
             'available_beds': len(self.beds) - occupied_beds,
-            'queue_length': len(self.patients_queue),
+            'queue_length': len(self._pq),
             'scheduled_surgeries': len(self.scheduled_surgeries),
-            'avg_priority': sum(p['priority'] for p in self.patients_queue) / max(len(self.patients_queue), 1)
+            'avg_priority': sum(-e[0] for e in self._pq) / max(len(self._pq), 1)
         }
 
 
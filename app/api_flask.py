@@ -1,25 +1,57 @@
 """Flask API endpoints (moved to app/)
 
-Simple demo endpoints that call into the `modules` library.
+Simple demo endpoints that call into the `modules` library. For production,
+serve `app.wsgi:application` with a WSGI server such as gunicorn.
 """
-from flask import Flask, request, jsonify
+import functools
+
+from flask import Flask, request, jsonify, abort
 from modules import bed_allocation, fuzzy_triage, nlp_chatbot
 
 app = Flask(__name__)
 
 
+def _json_body(*required):
+    """Parsed JSON body, or a 400 if it is missing or lacks a required field."""
+    data = request.get_json(cache=True, force=False, silent=True)
+    if not isinstance(data, dict) or any(data.get(k) is None for k in required):
+        abort(400)
+    return data
+
+
+def _fleet_key(beds):
+    # everything BedPool reads from a bed, so equal keys mean equal pools
+    return tuple(
+        (b.get('id'), bool(b.get('is_occupied')), bool(b.get('icu')), bool(b.get('vent')),
+         tuple(b.get('location', (0, 0))))
+        for b in beds
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _bed_pool(fleet):
+    """BedPool for a fleet key, shared across requests within the process."""
+    beds = [
+        {'id': bid, 'is_occupied': occ, 'icu': icu, 'vent': vent, 'location': loc}
+        for bid, occ, icu, vent, loc in fleet
+    ]
+    return bed_allocation.BedPool.from_dicts(beds)
+
+
 @app.route('/allocate', methods=['POST'])
 def allocate():
-    data = request.json
-    patient = data.get('patient')
-    beds = data.get('beds')
-    bed = bed_allocation.allocate_bed(patient, beds)
+    data = _json_body('patient', 'beds')
+    patient = data['patient']
+    beds = data['beds']
+    i = _bed_pool(_fleet_key(beds)).select(patient)
+    # answer with the caller's own bed dict, not the cached copy
+    bed = beds[i] if i >= 0 else None
     return jsonify({'bed': bed})
 
 
 @app.route('/priority', methods=['POST'])
 def priority():
-    data = request.json
+    data = _json_body('temp', 'sbp', 'pain')
     temp = data.get('temp')
     sbp = data.get('sbp')
     pain = data.get('pain')
@@ -29,10 +61,11 @@ def priority():
 
 @app.route('/chat', methods=['POST'])
 def chat():
-    data = request.json
+    data = _json_body()
     q = data.get('q', '')
     return jsonify({'answer': nlp_chatbot.respond(q)})
 
 
 if __name__ == '__main__':
+    # development server only; see app/wsgi.py for production serving
     app.run(debug=True)
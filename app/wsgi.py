@@ -0,0 +1,8 @@
+"""WSGI entrypoint for the Flask API.
+
+Run from the repository root with a production server, e.g.:
+    gunicorn -w 4 -k gthread --threads 8 app.wsgi:application
+"""
+from app.api_flask import app as application
+
+__all__ = ['application']
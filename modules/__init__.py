@@ -3,24 +3,34 @@
 This package provides a stable import path `modules.<module>` for the
 project. It re-exports the main functions / classes from individual
 module files.
+
+Submodules are imported on first attribute access (PEP 562), so
+`import modules` stays cheap and only the pieces a caller touches pull in
+their dependencies (scikit-learn, for instance, via `ml_predictor`).
 """
 
-from . import bed_allocation as bed_allocation
-from . import scheduling_csp as scheduling_csp
-from . import expert_system as expert_system
-from . import fuzzy_triage as fuzzy_triage
-from . import genetic_optimizer as genetic_optimizer
-from . import ml_predictor as ml_predictor
-from . import nn_classifier as nn_classifier
-from . import nlp_chatbot as nlp_chatbot
+import importlib
 
 __all__ = [
     'bed_allocation',
     'scheduling_csp',
+    'scheduling_cpsat',
     'expert_system',
     'fuzzy_triage',
     'genetic_optimizer',
     'ml_predictor',
     'nn_classifier',
     'nlp_chatbot',
+    'geometry',
+    'soa',
 ]
+
+
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module(f'{__name__}.{name}')
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,130 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""Compiled scoring kernels shared by bed allocation and the GA.
+
+Loaded through `modules.fastcore` via pyximport when Cython is available.
+The kernels work on plain C structs so the inner loops never touch Python
+objects; the `def` wrappers copy the caller's arrays into them once.
+"""
+from libc.stdlib cimport malloc, free
+
+import numpy as np
+
+
+cdef struct BedC:
+    int x, y
+    bint icu, vent, occupied
+
+
+cdef struct PatC:
+    int x, y
+    bint icu, vent
+
+
+cdef inline int _iabs(int v) nogil:
+    return -v if v < 0 else v
+
+
+cdef int allocate_bed_c(PatC pat, BedC* beds, int n, int penalty) nogil:
+    """Index of the lowest-scoring open bed (first on ties), or -1."""
+    cdef int i, score, best = -1, best_score = 0
+    for i in range(n):
+        if beds[i].occupied:
+            continue
+        score = _iabs(pat.x - beds[i].x) + _iabs(pat.y - beds[i].y)
+        if pat.icu and not beds[i].icu:
+            score += penalty
+        if pat.vent and not beds[i].vent:
+            score += penalty
+        if best < 0 or score < best_score:
+            best = i
+            best_score = score
+    return best
+
+
+cdef double fitness_c(int* chrom, int n, PatC* pats, BedC* beds, int m) nogil:
+    """Same scoring as genetic_optimizer.fitness for one chromosome."""
+    cdef int i, b
+    cdef double score = 0
+    for i in range(n):
+        b = chrom[i]
+        if b < 0 or b >= m:
+            score -= 1
+            continue
+        if pats[i].icu and beds[b].icu:
+            score += 2
+        if pats[i].vent and beds[b].vent:
+            score += 2
+        score -= 0.1 * (_iabs(pats[i].x - beds[b].x) + _iabs(pats[i].y - beds[b].y))
+    return score
+
+
+cdef BedC* _pack_beds(const int[:, ::1] xy, const unsigned char[::1] icu,
+                      const unsigned char[::1] vent, const unsigned char[::1] occupied) except NULL:
+    cdef Py_ssize_t i, n = xy.shape[0]
+    cdef BedC* beds = <BedC*> malloc(max(n, 1) * sizeof(BedC))
+    if beds == NULL:
+        raise MemoryError()
+    for i in range(n):
+        beds[i].x = xy[i, 0]
+        beds[i].y = xy[i, 1]
+        beds[i].icu = icu[i]
+        beds[i].vent = vent[i]
+        beds[i].occupied = occupied[i]
+    return beds
+
+
+def select_bed(int px, int py, bint need_icu, bint need_vent, xy, icu, vent, occupied,
+               int penalty):
+    """Python entry point for allocate_bed_c over BedPool-style arrays."""
+    cdef PatC pat
+    pat.x = px
+    pat.y = py
+    pat.icu = need_icu
+    pat.vent = need_vent
+    cdef BedC* beds = _pack_beds(
+        np.ascontiguousarray(xy, dtype=np.intc),
+        np.ascontiguousarray(icu, dtype=np.uint8),
+        np.ascontiguousarray(vent, dtype=np.uint8),
+        np.ascontiguousarray(occupied, dtype=np.uint8),
+    )
+    try:
+        return allocate_bed_c(pat, beds, len(icu), penalty)
+    finally:
+        free(beds)
+
+
+def fitness_batch(P, pat_icu, pat_vent, pat_xy, bed_icu, bed_vent, bed_xy):
+    """Score every row of the (pop_size, n) population P with fitness_c."""
+    cdef const int[:, ::1] chroms = np.ascontiguousarray(P, dtype=np.intc)
+    cdef const int[:, ::1] pxy = np.ascontiguousarray(pat_xy, dtype=np.intc)
+    cdef const unsigned char[::1] picu = np.ascontiguousarray(pat_icu, dtype=np.uint8)
+    cdef const unsigned char[::1] pvent = np.ascontiguousarray(pat_vent, dtype=np.uint8)
+    cdef Py_ssize_t i, rows = chroms.shape[0]
+    cdef int n = chroms.shape[1], m = len(bed_icu)
+    out = np.empty(rows, dtype=np.float64)
+    cdef double[::1] res = out
+    cdef PatC* pats = <PatC*> malloc(max(n, 1) * sizeof(PatC))
+    if pats == NULL:
+        raise MemoryError()
+    cdef BedC* beds = NULL
+    try:
+        for i in range(n):
+            pats[i].x = pxy[i, 0]
+            pats[i].y = pxy[i, 1]
+            pats[i].icu = picu[i]
+            pats[i].vent = pvent[i]
+        beds = _pack_beds(
+            np.ascontiguousarray(bed_xy, dtype=np.intc),
+            np.ascontiguousarray(bed_icu, dtype=np.uint8),
+            np.ascontiguousarray(bed_vent, dtype=np.uint8),
+            np.zeros(len(bed_icu), dtype=np.uint8),
+        )
+        for i in range(rows):
+            if n == 0:
+                res[i] = 0
+                continue
+            res[i] = fitness_c(<int*> &chroms[i, 0], n, pats, beds, m)
+    finally:
+        free(pats)
+        free(beds)
+    return out
@@ -3,40 +3,92 @@
 This file implements a simplified A*-like scoring function to select a
 bed that best matches patient needs and proximity.
 """
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Union
+
+import numpy as np
+
+from . import fastcore, soa
+from ._layout import pack_locations
+
+# Score added per required feature (ICU / ventilator) the bed lacks.
+MISSING_FEATURE_PENALTY = 100
 
 
 def manhattan(a: Tuple[int, int], b: Tuple[int, int]) -> int:
     return abs(a[0] - b[0]) + abs(a[1] - b[1])
 
 
-def allocate_bed(patient: Dict, beds: List[Dict]) -> Optional[Dict]:
+class BedPool(soa.Beds):
+    """Beds container with the allocation heuristic attached.
+
+    Bed attributes live in flat NumPy arrays so a patient can be scored
+    against every bed with a handful of vector operations. `beds` keeps the
+    original dicts, so selections are returned as the caller's own objects.
+    """
+
+    def select(self, patient: Dict, dist: Optional[np.ndarray] = None) -> int:
+        """Return the index of the best open bed for `patient`, or -1.
+
+        dist: optional precomputed distances from the patient to every bed
+            (a row of geometry.pairwise_manhattan), e.g. when a batch of
+            patients is allocated at once.
+        """
+        free = ~self.occupied
+        if not free.any():
+            return -1
+        need_icu = bool(patient.get("needs_icu"))
+        need_vent = bool(patient.get("needs_vent"))
+        if dist is None:
+            if fastcore.FASTCORE_AVAILABLE and self.xy.dtype == np.int32:
+                loc = pack_locations([patient])
+                if loc.dtype == np.int32:
+                    px, py = loc[0].tolist()
+                    return fastcore.select_bed(px, py, need_icu, need_vent, self.xy,
+                                               self.icu, self.vent, self.occupied, MISSING_FEATURE_PENALTY)
+            # int64 / float64 operands, so neither overflow nor truncation
+            pat_xy = np.asarray(patient.get("location", (0, 0)))
+            if pat_xy.dtype.kind not in "iuf":
+                pat_xy = pack_locations([patient])[0]
+
+        # Fast path: score only the open beds that have every required
+        # feature. Any bed missing a feature scores at least the penalty, so
+        # a matched bed closer than that is the overall winner.
+        matched = np.flatnonzero(free & (self.icu | (not need_icu)) & (self.vent | (not need_vent)))
+        if len(matched):
+            if dist is None:
+                d = np.abs(self.xy[matched] - pat_xy).sum(1)
+            else:
+                d = dist[matched]
+            j = int(d.argmin())
+            if d[j] < MISSING_FEATURE_PENALTY:
+                return int(matched[j])
+
+        if dist is None:
+            dist = np.abs(self.xy - pat_xy).sum(1)
+        # Heuristic: distance + heavy penalty for missing required features.
+        # Integer coordinates keep the score in integers (Manhattan needs no
+        # sqrt); occupied beds then get the dtype's max rather than inf.
+        missing = (need_icu & ~self.icu).astype(np.int32) + (need_vent & ~self.vent)
+        score = dist + MISSING_FEATURE_PENALTY * missing
+        blocked = np.inf if score.dtype.kind == 'f' else np.iinfo(score.dtype).max
+        score = np.where(free, score, blocked)
+        return int(score.argmin())
+
+
+def allocate_bed(patient: Dict, beds: Union[List[Dict], soa.Beds]) -> Optional[Dict]:
     """Allocate a best-fit bed for the patient using an A*-style scoring.
 
     patient: dict with keys 'id', 'needs_icu' (bool), 'needs_vent' (bool), 'location' (x,y)
-    beds: list of dicts with keys 'id', 'is_occupied', 'icu', 'vent', 'location'
+    beds: list of dicts with keys 'id', 'is_occupied', 'icu', 'vent', 'location',
+        or a prebuilt soa.Beds / BedPool over such a list
 
     Returns the selected bed dict or None if no match.
     """
-    open_beds = [b for b in beds if not b.get("is_occupied")]
-    if not open_beds:
+    pool = soa.as_beds(beds, BedPool)
+    i = pool.select(patient)
+    if i < 0:
         return None
-
-    best = None
-    best_score = float("inf")
-    for bed in open_beds:
-        # Heuristic: distance + heavy penalty for missing required features
-        dist = manhattan(tuple(patient.get("location", (0, 0))), tuple(bed.get("location", (0, 0))))
-        penalty = 0
-        if patient.get("needs_icu") and not bed.get("icu"):
-            penalty += 100
-        if patient.get("needs_vent") and not bed.get("vent"):
-            penalty += 100
-        score = dist + penalty
-        if score < best_score:
-            best_score = score
-            best = bed
-    return best
+    return pool.beds[i]
 
 
 if __name__ == "__main__":
@@ -2,29 +2,105 @@
 
 Small, educational expert system operating on propositional facts.
 """
-from typing import List, Dict
+import functools
+import sys
+from collections import defaultdict
+from typing import List, Dict, FrozenSet, Iterable, Tuple
 
 
 class ExpertSystem:
     def __init__(self, rules: List[Dict]):
-        self.rules = rules
+        self.rules = list(rules)
         self.facts = set()
+        # Rete-style alpha index: each rule keeps a count of antecedents not
+        # yet seen, and a fact only touches the rules that mention it. A rule
+        # fires when its count reaches zero. Literals are interned so the
+        # same fact string is shared across rules and derived snapshots.
+        self._cond_sets = []
+        self._rule_then = []
+        self._by_cond = defaultdict(list)
+        self._unconditional = []
+        for rule in self.rules:
+            self._index_rule(rule)
+        self._reset_cache()
+        self._last_snapshot: Tuple[str, ...] = ()
+
+    def _index_rule(self, rule: Dict) -> None:
+        i = len(self._cond_sets)
+        conds = frozenset(map(sys.intern, rule.get('if', [])))
+        self._cond_sets.append(conds)
+        self._rule_then.append(tuple(map(sys.intern, rule.get('then', []))))
+        for cond in conds:
+            self._by_cond[cond].append(i)
+        if not conds:
+            self._unconditional.append(i)
+
+    def _reset_cache(self) -> None:
+        # Closures are memoized per input fact set; any rule change
+        # invalidates them, so the cache is simply rebuilt.
+        self._closure = functools.lru_cache(maxsize=1024)(self._compute_closure)
+        self._sorted_closure = functools.lru_cache(maxsize=1024)(self._compute_sorted_closure)
+
+    def add_rule(self, rule: Dict) -> None:
+        """Add a rule; it applies from the next infer()/closure() call."""
+        self.rules.append(rule)
+        self._index_rule(rule)
+        self._reset_cache()
 
     def assert_fact(self, fact: str):
-        self.facts.add(fact)
+        self.facts.add(sys.intern(fact))
+
+    def _compute_closure(self, facts: FrozenSet[str]) -> FrozenSet[str]:
+        # Worklist forward chaining: every fact is processed once, so the
+        # fixpoint costs O(facts + antecedent hits) rather than re-testing
+        # rules each sweep.
+        derived = set(facts)
+        remaining = [len(conds) for conds in self._cond_sets]
+        queue = list(facts)
+
+        def fire(i):
+            for fact in self._rule_then[i]:
+                if fact not in derived:
+                    derived.add(fact)
+                    queue.append(fact)
+
+        for i in self._unconditional:
+            fire(i)
+        seen = set()
+        while queue:
+            fact = queue.pop()
+            if fact in seen:
+                continue
+            seen.add(fact)
+            for i in self._by_cond.get(fact, ()):
+                remaining[i] -= 1
+                if remaining[i] == 0:
+                    fire(i)
+        return frozenset(derived)
+
+    def _compute_sorted_closure(self, facts: FrozenSet[str]) -> Tuple[str, ...]:
+        return tuple(sorted(self._closure(facts)))
+
+    def closure(self, facts: Iterable[str]) -> FrozenSet[str]:
+        """All facts derivable from `facts`, without touching `self.facts`.
+
+        Results are memoized per fact set until the rules change.
+        """
+        return self._closure(facts if isinstance(facts, frozenset) else frozenset(facts))
+
+    def sorted_closure(self, facts: Iterable[str]) -> Tuple[str, ...]:
+        """closure() as a sorted tuple, memoized alongside it."""
+        return self._sorted_closure(facts if isinstance(facts, frozenset) else frozenset(facts))
 
     def infer(self, max_iterations: int = 50) -> None:
-        # Forward chaining until no new facts
-        for _ in range(max_iterations):
-            added = False
-            for r in self.rules:
-                if all(cond in self.facts for cond in r.get('if', [])):
-                    for a in r.get('then', []):
-                        if a not in self.facts:
-                            self.facts.add(a)
-                            added = True
-            if not added:
-                break
+        # `max_iterations` is kept for API compatibility; the fixpoint is
+        # always reached.
+        self.facts.update(self.closure(self.facts))
+        self._last_snapshot = tuple(sorted(self.facts))
+
+    def diagnoses(self) -> Tuple[str, ...]:
+        """Sorted facts as of the last infer() call."""
+        return self._last_snapshot
 
     def query(self, q: str) -> bool:
         return q in self.facts
@@ -0,0 +1,33 @@
+"""Optional compiled kernels for bed scoring and GA fitness.
+
+`modules/_fastcore.pyx` is built on first import through pyximport when
+Cython (and a C compiler) is available. Callers check `FASTCORE_AVAILABLE`
+and fall back to the NumPy implementations otherwise, so the package keeps
+working in pure Python.
+
+The first import in a fresh environment compiles the extension, which takes
+a few seconds; pyximport caches the build under ~/.pyxbld, so later imports
+load it directly. Cython is an optional dependency (see requirements.txt).
+"""
+
+try:
+    import pyximport
+
+    _importers = pyximport.install(language_level=3, inplace=False)
+    try:
+        from . import _fastcore as _impl
+    finally:
+        # only our own .pyx should go through pyximport
+        pyximport.uninstall(*_importers)
+    FASTCORE_AVAILABLE = True
+except Exception:  # pragma: no cover - environment dependent
+    _impl = None
+    FASTCORE_AVAILABLE = False
+
+
+def select_bed(px, py, need_icu, need_vent, xy, icu, vent, occupied, penalty):
+    return _impl.select_bed(px, py, need_icu, need_vent, xy, icu, vent, occupied, penalty)
+
+
+def fitness_batch(P, pat_icu, pat_vent, pat_xy, bed_icu, bed_vent, bed_xy):
+    return _impl.fitness_batch(P, pat_icu, pat_vent, pat_xy, bed_icu, bed_vent, bed_xy)
@@ -5,6 +5,20 @@ Output: priority score 0-100 (higher = higher priority)
 """
 from typing import Dict
 
+import numpy as np
+
+# Numba kernels live in fuzzy_triage_numba and are loaded on first use;
+# None until then, False when numba is unavailable.
+_numba = None
+
+
+def _numba_kernels():
+    global _numba
+    if _numba is None:
+        from . import fuzzy_triage_numba
+        _numba = fuzzy_triage_numba if fuzzy_triage_numba.NUMBA_AVAILABLE else False
+    return _numba
+
 
 def fuzz_temp(temp: float) -> Dict[str, float]:
     # low, normal, high
@@ -33,26 +47,104 @@ def fuzz_pain(pain: float) -> Dict[str, float]:
     }
 
 
-def compute_priority(temp: float, sbp: float, pain: float) -> float:
-    t = fuzz_temp(temp)
-    b = fuzz_bp(sbp)
-    p = fuzz_pain(pain)
+# Every membership above is a clamped affine function of one input:
+#     clip(A*x + B + C*|x - D|, 0, 1)
+# with rows ordered temp (low, normal, high), bp (low, normal, high),
+# pain (mild, moderate, severe).
+_A = np.array([-1 / 2.0, 0.0, 1 / 3.0, -1 / 40.0, 0.0, 1 / 40.0, -1 / 5.0, 0.0, 1 / 5.0])
+_B = np.array([37.0 / 2.0, 1.0, -37.0 / 3.0, 3.0, 1.0, -3.0, 1.0, 1.0, -1.0])
+_C = np.array([0.0, -1 / 1.5, 0.0, 0.0, -1 / 20.0, 0.0, 0.0, -1 / 3.0, 0.0])
+_D = np.array([0.0, 37.0, 0.0, 0.0, 120.0, 0.0, 0.0, 5.0, 0.0])
+_TRI = slice(1, 9, 3)
+_BLOCK = 4096
+
 
+def _memberships(temp, sbp, pain, out: np.ndarray) -> None:
+    """Write all nine memberships into `out` (shape (9,) or (9, N))."""
+    shape = (9,) + (1,) * (out.ndim - 1)
+    tri_shape = (3,) + shape[1:]
+    out[0:3] = temp
+    out[3:6] = sbp
+    out[6:9] = pain
+    # C is only non-zero on the triangular "normal"/"moderate" rows
+    dev = out[_TRI] - _D[_TRI].reshape(tri_shape)
+    np.abs(dev, out=dev)
+    dev *= _C[_TRI].reshape(tri_shape)
+    out *= _A.reshape(shape)
+    out += _B.reshape(shape)
+    out[_TRI] += dev
+    np.clip(out, 0.0, 1.0, out=out)
+
+
+def _compute_priority_scalar(temp: float, sbp: float, pain: float) -> float:
+    # Same memberships and rules as _memberships / compute_priority_batch,
+    # unrolled on locals in their affine form (no divisions, no dicts).
+    # The constants repeat _A.._D; test_scalar_kernel_matches_memberships
+    # fails if the two drift apart.
+    # Plain Python so fuzzy_triage_numba can compile it with njit.
+    # b_low only feeds the unused bp-low rule, so it is not computed.
+    t_low = max(0.0, min(1.0, 18.5 - 0.5 * temp))
+    t_normal = max(0.0, min(1.0, 1.0 - abs(temp - 37.0) * (1 / 1.5)))
+    t_high = max(0.0, min(1.0, temp * (1 / 3.0) - 37.0 / 3.0))
+    b_normal = max(0.0, min(1.0, 1.0 - abs(sbp - 120.0) * 0.05))
+    b_high = max(0.0, min(1.0, sbp * 0.025 - 3.0))
+    p_mild = max(0.0, min(1.0, 1.0 - 0.2 * pain))
+    p_moderate = max(0.0, min(1.0, 1.0 - abs(pain - 5.0) * (1 / 3.0)))
+    p_severe = max(0.0, min(1.0, 0.2 * pain - 1.0))
+
+    high_strength = max(t_high, p_severe, b_high)
+    medium_strength = min(t_normal, p_moderate, b_normal)
+    low_strength = max(t_low, p_mild)
+
+    numerator = high_strength * 90.0 + medium_strength * 50.0 + low_strength * 10.0
+    denom = high_strength + medium_strength + low_strength
+    if denom == 0.0:
+        return 0.0
+    return numerator / denom
+
+
+def compute_priority(temp: float, sbp: float, pain: float) -> float:
     # Rules (small set):
     # If temp is high OR pain is severe OR bp is high -> high priority
     # If temp is normal and pain moderate and bp normal -> medium
     # If temp low and pain mild -> low
+    # Defuzzify using weighted average of representative scores
+    kernels = _numba_kernels()
+    kernel = kernels.priority_scalar if kernels else _compute_priority_scalar
+    return float(kernel(float(temp), float(sbp), float(pain)))
 
-    high_strength = max(t['high'], p['severe'], b['high'])
-    medium_strength = min(t['normal'], p['moderate'], b['normal'])
-    low_strength = max(t['low'], p['mild'])
 
-    # Defuzzify using weighted average of representative scores
-    numerator = high_strength * 90 + medium_strength * 50 + low_strength * 10
-    denom = high_strength + medium_strength + low_strength
-    if denom == 0:
-        return 0.0
-    return float(numerator / denom)
+def compute_priority_batch(temp: np.ndarray, sbp: np.ndarray, pain: np.ndarray) -> np.ndarray:
+    """Vectorized `compute_priority` over equally shaped arrays of vitals."""
+    temp, sbp, pain = np.broadcast_arrays(
+        np.asarray(temp, dtype=np.float64),
+        np.asarray(sbp, dtype=np.float64),
+        np.asarray(pain, dtype=np.float64),
+    )
+    shape = temp.shape
+    temp, sbp, pain = temp.ravel(), sbp.ravel(), pain.ravel()
+    kernels = _numba_kernels()
+    if kernels:
+        return kernels.priority_batch(temp, sbp, pain).reshape(shape)
+    n = temp.size
+    result = np.empty(n)
+    # one (9, block) membership buffer is reused so the working set stays
+    # in cache for large batches
+    buf = np.empty((9, min(n, _BLOCK)))
+    for lo in range(0, n, _BLOCK):
+        hi = min(lo + _BLOCK, n)
+        m = buf[:, :hi - lo]
+        _memberships(temp[lo:hi], sbp[lo:hi], pain[lo:hi], m)
+
+        high_strength = np.maximum(np.maximum(m[2], m[5]), m[8])
+        medium_strength = np.minimum(np.minimum(m[1], m[4]), m[7])
+        low_strength = np.maximum(m[0], m[6])
+
+        numerator = high_strength * 90 + medium_strength * 50 + low_strength * 10
+        denom = high_strength + medium_strength + low_strength
+        safe = np.where(denom == 0, 1.0, denom)
+        result[lo:hi] = np.where(denom == 0, 0.0, numerator / safe)
+    return result.reshape(shape)
 
 
 if __name__ == '__main__':
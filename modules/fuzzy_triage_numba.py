@@ -0,0 +1,24 @@
+"""Optional Numba kernels for fuzzy triage scoring.
+
+Compiles the scalar rule kernel from `fuzzy_triage` with `@njit` and wraps
+it in a `@guvectorize` batch ufunc. `fuzzy_triage` imports this module
+lazily on first use and checks `NUMBA_AVAILABLE`, falling back to its pure
+Python / NumPy paths when numba is not installed.
+"""
+
+from . import fuzzy_triage
+
+try:
+    from numba import guvectorize, njit
+    NUMBA_AVAILABLE = True
+except Exception:  # pragma: no cover - environment dependent
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:  # pragma: no cover - environment dependent
+    priority_scalar = njit(fastmath=True, cache=True)(fuzzy_triage._compute_priority_scalar)
+
+    @guvectorize(['(f8[:], f8[:], f8[:], f8[:])'], '(n),(n),(n)->(n)', nopython=True, cache=True)
+    def priority_batch(temp, sbp, pain, out):
+        for i in range(temp.shape[0]):
+            out[i] = priority_scalar(temp[i], sbp[i], pain[i])
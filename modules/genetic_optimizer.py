@@ -2,11 +2,32 @@
 
 Chromosome: list of bed indices (or -1 for unassigned) per patient.
 """
-import random
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple, Union
 
+import numpy as np
 
-def fitness(chrom: List[int], patients: List[Dict], beds: List[Dict]) -> float:
+from . import fastcore, geometry, soa
+
+# Shared generator for all GA runs; pass `rng` to ga_optimize for reproducibility.
+_rng = np.random.default_rng()
+
+# Numba operator kernels from genetic_optimizer_numba, loaded on first use;
+# None until then, False when numba is unavailable.
+_numba = None
+
+
+def _numba_kernels():
+    global _numba
+    if _numba is None:
+        from . import genetic_optimizer_numba
+        _numba = genetic_optimizer_numba if genetic_optimizer_numba.NUMBA_AVAILABLE else False
+    return _numba
+
+
+def fitness(chrom: List[int], patients: Union[List[Dict], soa.Patients],
+            beds: Union[List[Dict], soa.Beds]) -> float:
+    if isinstance(patients, soa.Patients) or isinstance(beds, soa.Beds):
+        return float(fitness_batch([chrom], patients, beds)[0])
     score = 0
     for i, b_idx in enumerate(chrom):
         if b_idx < 0 or b_idx >= len(beds):
@@ -24,28 +45,136 @@ def fitness(chrom: List[int], patients: List[Dict], beds: List[Dict]) -> float:
     return score
 
 
-def ga_optimize(patients: List[Dict], beds: List[Dict], pop_size=50, gens=50) -> List[int]:
+def _fitness_vec(P: np.ndarray, pat_icu: np.ndarray, pat_vent: np.ndarray,
+                 bed_icu: np.ndarray, bed_vent: np.ndarray, dist: np.ndarray) -> np.ndarray:
+    """Evaluate `fitness` for a whole population at once.
+
+    P is a (pop_size, n) array of bed indices; the remaining arguments are the
+    per-patient / per-bed attribute arrays built once by `ga_optimize`, with
+    `dist` the (n, m) patient-to-bed Manhattan distance matrix.
+    Returns a (pop_size,) float array matching `fitness` row by row.
+    """
+    n, m = P.shape[1], len(bed_icu)
+    if m == 0:
+        return np.full(len(P), -float(n))
+    valid = (P >= 0) & (P < m)
+    safe = np.where(valid, P, 0)
+    icu_hits = (pat_icu & bed_icu[safe] & valid).sum(1)
+    vent_hits = (pat_vent & bed_vent[safe] & valid).sum(1)
+    d = (dist[np.arange(n), safe] * valid).sum(1)
+    return 2 * icu_hits + 2 * vent_hits - 0.1 * d - (~valid).sum(1)
+
+
+def _crossover_kernel(pop: np.ndarray, pairs: np.ndarray, cut_points: np.ndarray,
+                      out: np.ndarray) -> None:
+    """Single-point crossover: row i of `out` takes genes before
+    `cut_points[i]` from parent `pairs[0, i]` and the rest from `pairs[1, i]`."""
+    head = np.arange(pop.shape[1]) < cut_points[:, None]
+    np.copyto(out, np.where(head, pop[pairs[0]], pop[pairs[1]]))
+
+
+def _mutate_kernel(pop: np.ndarray, rows: np.ndarray, cols: np.ndarray,
+                   new_vals: np.ndarray) -> None:
+    """Set gene `cols[k]` of row `rows[k]` to `new_vals[k]`, in place."""
+    pop[rows, cols] = new_vals
+
+
+def fitness_batch(pop: np.ndarray, patients: Union[List[Dict], soa.Patients],
+                  beds: Union[List[Dict], soa.Beds],
+                  dist: Optional[np.ndarray] = None) -> np.ndarray:
+    """`fitness` for every row of a (pop_size, n) population at once.
+
+    dist: optional precomputed (len(patients), len(beds)) Manhattan distance
+        matrix; built from the bed/patient locations when omitted.
+    """
+    P = np.atleast_2d(np.asarray(pop, dtype=np.int64))
+    pats, bd = soa.as_patients(patients), soa.as_beds(beds)
+    if dist is None:
+        dist = geometry.pairwise_manhattan(pats.xy, bd.xy)
+    return _fitness_vec(P, pats.needs_icu, pats.needs_vent, bd.icu, bd.vent, dist)
+
+
+def ga_optimize(patients: Union[List[Dict], soa.Patients], beds: Union[List[Dict], soa.Beds],
+                pop_size=50, gens=50,
+                rng: Optional[np.random.Generator] = None,
+                dist: Optional[np.ndarray] = None,
+                warm_pop: Optional[np.ndarray] = None) -> List[int]:
+    """Search bed assignments for `patients` maximizing `fitness`.
+
+    dist: optional precomputed (len(patients), len(beds)) Manhattan distance
+        matrix (see geometry.pairwise_manhattan), e.g. shared with bed
+        allocation for the same batch.
+    warm_pop: optional (k, len(patients)) population to start from instead of
+        a random one, e.g. the final population of an earlier run.
+    """
+    return ga_evolve(patients, beds, pop_size, gens, rng=rng, dist=dist, warm_pop=warm_pop)[0]
+
+
+def ga_evolve(patients: Union[List[Dict], soa.Patients], beds: Union[List[Dict], soa.Beds],
+              pop_size=50, gens=50,
+              rng: Optional[np.random.Generator] = None,
+              dist: Optional[np.ndarray] = None,
+              warm_pop: Optional[np.ndarray] = None) -> Tuple[List[int], np.ndarray]:
+    """Run the GA like `ga_optimize` and also return the final population.
+
+    The population is an (pop_size, n) int16 array sorted best-first, suitable
+    as `warm_pop` for a later run on (nearly) the same patients.
+    """
+    rng = _rng if rng is None else rng
     n = len(patients)
     m = len(beds)
-    # initialize population
-    pop = [[random.randint(-1, m-1) for _ in range(n)] for _ in range(pop_size)]
+    if n == 0:
+        return [], np.empty((0, 0), dtype=np.int16)
+    # structure-of-arrays views of the inputs, built once per run
+    pats = soa.as_patients(patients)
+    bd = soa.as_beds(beds)
+    pat_icu, pat_vent, pat_xy = pats.needs_icu, pats.needs_vent, pats.xy
+    bed_icu, bed_vent, bed_xy = bd.icu, bd.vent, bd.xy
+    # the compiled kernel takes int32 coordinates only
+    use_fastcore = fastcore.FASTCORE_AVAILABLE and pat_xy.dtype == bed_xy.dtype == np.int32
+    if dist is None and not use_fastcore:
+        dist = geometry.pairwise_manhattan(pat_xy, bed_xy)
+
+    def fitness_vec(P: np.ndarray) -> np.ndarray:
+        if use_fastcore:
+            return fastcore.fitness_batch(P, pat_icu, pat_vent, pat_xy, bed_icu, bed_vent, bed_xy)
+        return _fitness_vec(P, pat_icu, pat_vent, bed_icu, bed_vent, dist)
+
+    # initialize population; `fit` is carried alongside P so survivors keep
+    # their score and only freshly bred children are ever evaluated
+    P = rng.integers(-1, m, size=(pop_size, n)).astype(np.int16)
+    if warm_pop is not None:
+        warm = np.asarray(warm_pop, dtype=np.int16)[:pop_size]
+        P[:len(warm)] = np.clip(warm, -1, m - 1)
+    fit = fitness_vec(P)
+    kernels = _numba_kernels()
+    crossover = kernels.crossover_kernel if kernels else _crossover_kernel
+    mutate_genes = kernels.mutate_kernel if kernels else _mutate_kernel
     for g in range(gens):
-        pop = sorted(pop, key=lambda c: -fitness(c, patients, beds))
-        # keep top 10
-        next_pop = pop[:10]
-        # crossover
-        while len(next_pop) < pop_size:
-            a, b = random.sample(pop[:20], 2)
-            cx = random.randint(1, n-1)
-            child = a[:cx] + b[cx:]
-            # mutation
-            if random.random() < 0.1:
-                idx = random.randrange(n)
-                child[idx] = random.randint(-1, m-1)
-            next_pop.append(child)
-        pop = next_pop
-    best = max(pop, key=lambda c: fitness(c, patients, beds))
-    return best
+        # keep top 10; only the set matters here, so partition instead of sort
+        elite = min(10, len(P))
+        top = np.argpartition(-fit, elite - 1)[:elite] if elite < len(P) else np.arange(len(P))
+        children = pop_size - elite
+        if children <= 0:
+            P, fit = P[top], fit[top]
+            continue
+        # tournament selection (k=3): one parent pair per child
+        k = 3
+        idx = rng.integers(0, len(P), size=(2, children, k))
+        winners = np.take_along_axis(idx, fit[idx].argmax(-1)[..., None], -1)[..., 0]
+        # single-point crossover
+        cx = rng.integers(1, max(n, 2), size=children)
+        kids = np.empty((children, n), dtype=P.dtype)
+        crossover(P, winners, cx, kids)
+        # mutation: 10% of children get one gene redrawn
+        mutate = np.flatnonzero(rng.random(children) < 0.1)
+        new_vals = rng.integers(-1, m, size=len(mutate)).astype(P.dtype)
+        mutate_genes(kids, mutate, rng.integers(0, n, size=len(mutate)), new_vals)
+        P = np.vstack([P[top], kids])
+        fit = np.concatenate([fit[top], fitness_vec(kids)])
+    order = np.argsort(-fit, kind='stable')
+    P = P[order]
+    return P[0].tolist(), P
 
 
 if __name__ == '__main__':
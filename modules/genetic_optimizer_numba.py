@@ -0,0 +1,29 @@
+"""Optional Numba kernels for the GA crossover and mutation operators.
+
+`genetic_optimizer` imports this module lazily on the first GA run and
+checks `NUMBA_AVAILABLE`, falling back to its NumPy kernels (same
+signatures) otherwise. All random numbers are drawn by the caller, so no
+PRNG state crosses into compiled code.
+"""
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except Exception:  # pragma: no cover - environment dependent
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:  # pragma: no cover - environment dependent
+    @njit(parallel=True, cache=True, boundscheck=False)
+    def crossover_kernel(pop, pairs, cut_points, out):
+        n = pop.shape[1]
+        for i in prange(out.shape[0]):
+            a, b, cut = pairs[0, i], pairs[1, i], cut_points[i]
+            for j in range(n):
+                out[i, j] = pop[a, j] if j < cut else pop[b, j]
+
+    @njit(parallel=True, cache=True, boundscheck=False)
+    def mutate_kernel(pop, rows, cols, new_vals):
+        # rows are distinct, so iterations never write the same gene
+        for k in prange(rows.shape[0]):
+            pop[rows[k], cols[k]] = new_vals[k]
@@ -0,0 +1,32 @@
+"""Vectorized ward geometry helpers shared by bed allocation and the GA.
+
+Coordinates are (x, y) grid positions; distances are Manhattan, matching
+`bed_allocation.manhattan`.
+"""
+import numpy as np
+
+# Coordinates in this range keep every per-axis difference inside int8.
+_INT8_SAFE = (-64, 63)
+
+
+def pairwise_manhattan(pat_xy: np.ndarray, bed_xy: np.ndarray) -> np.ndarray:
+    """Manhattan distance from every patient to every bed.
+
+    pat_xy: (P, 2) array of patient locations
+    bed_xy: (B, 2) array of bed locations
+
+    Returns a (P, B) array: int32 for integer coordinates on the small grid,
+    where the broadcast difference is computed in int8 (cutting the memory
+    traffic of the (P, B, 2) intermediate), int64 for other integer
+    coordinates and float64 when either side has fractional coordinates.
+    """
+    pat_xy = np.asarray(pat_xy).reshape(-1, 2)
+    bed_xy = np.asarray(bed_xy).reshape(-1, 2)
+    if pat_xy.dtype.kind == 'f' or bed_xy.dtype.kind == 'f':
+        dtype = out = np.float64
+    else:
+        lo, hi = _INT8_SAFE
+        small = all(a.size == 0 or (a.min() >= lo and a.max() <= hi) for a in (pat_xy, bed_xy))
+        dtype, out = (np.int8, np.int32) if small else (np.int64, np.int64)
+    diff = pat_xy.astype(dtype)[:, None, :] - bed_xy.astype(dtype)[None, :, :]
+    return np.abs(diff).sum(-1, dtype=out)
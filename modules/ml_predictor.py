@@ -2,6 +2,7 @@
 
 Includes dataset creation, training, and a predict interface.
 """
+import functools
 from typing import Tuple
 import numpy as np
 
@@ -20,7 +21,10 @@ except Exception:  # pragma: no cover - environment dependent
     _SKLEARN_AVAILABLE = False
 
 
+@functools.lru_cache(maxsize=1)
 def make_sample_dataset(n=200):
+    # Deterministic (fixed seed), so the arrays are built once and shared;
+    # they are returned read-only to keep callers from mutating the cache.
     # features: age, temp, sbp, pain
     rng = np.random.RandomState(0)
     age = rng.randint(20, 90, size=n)
@@ -30,6 +34,8 @@ def make_sample_dataset(n=200):
     # label: admission if temp>38 or pain>7 or age>75
     y = ((temp > 38) | (pain > 7) | (age > 75)).astype(int)
     X = np.vstack([age, temp, sbp, pain]).T
+    X.setflags(write=False)
+    y.setflags(write=False)
     return X, y
 
 
@@ -3,22 +3,99 @@
 Contains a rule/regex-based responder with a fallback message.
 """
 import re
+import threading
 from typing import Optional
 
+# Hyperscan is optional; when present all intents are matched by one
+# precompiled block-mode database instead of the `re` alternation.
+try:
+    import hyperscan
+    _HYPERSCAN_AVAILABLE = True
+except Exception:  # pragma: no cover - environment dependent
+    hyperscan = None
+    _HYPERSCAN_AVAILABLE = False
 
-RESPONSES = [
-    (re.compile(r".*(hello|hi|hey).*", re.I), "Hello! How can I help you today?"),
-    (re.compile(r".*(appointment|schedule).*", re.I), "You can request an appointment through the dashboard or call reception."),
-    (re.compile(r".*(fever|temperature).*", re.I), "If you have fever, please measure your temperature and seek triage if > 38C."),
+# (intent, pattern, response). All intents are compiled into one alternation
+# so a single search both finds and names the matching intent. Keywords are
+# whole words, so e.g. "this" or "high" no longer read as a greeting.
+INTENTS = [
+    ('greet', r"\b(?:hello|hi|hey)\b", "Hello! How can I help you today?"),
+    ('appt', r"\b(?:appointment|schedule)", "You can request an appointment through the dashboard or call reception."),
+    ('fever', r"\b(?:fever|temperature)", "If you have fever, please measure your temperature and seek triage if > 38C."),
 ]
 
+INTENT_RE = re.compile("|".join(f"(?P<{name}>{pattern})" for name, pattern, _ in INTENTS), re.I)
+RESPONSES = {name: resp for name, _, resp in INTENTS}
+FALLBACK = "I can help with appointments, triage advice, or hospital info. Please ask specifically."
+
+# Hyperscan has no \b in Unicode (UCP) mode, so its database holds the
+# keywords without the anchors and only proposes candidates; each candidate is
+# confirmed with the intent's own `re` pattern at that position. This keeps the
+# answers identical to the `re` path, including for non-ASCII text.
+_INTENT_PATTERNS = [re.compile(pattern, re.I) for _, pattern, _ in INTENTS]
+# Non-ASCII characters that `re.I` treats as equal to an ASCII letter but
+# Hyperscan's caseless mode does not; spelled out so no candidate is missed.
+_RE_CASE_EXTRAS = {'i': 'İı', 's': 'ſ', 'k': '\u212a'}
+
+
+def _hs_expression(pattern: str) -> bytes:
+    pattern = pattern.replace(r"\b", "")
+    pattern = re.sub("[iskISK]", lambda m: f"[{m.group()}{_RE_CASE_EXTRAS[m.group().lower()]}]", pattern)
+    return pattern.encode()
+
+
+_hs_db = None
+_hs_lock = threading.Lock()
+# A scratch space serves one scan at a time, so each thread (e.g. a gthread
+# worker serving /chat) allocates its own.
+_hs_local = threading.local()
+
+
+def _hyperscan_db():
+    global _hs_db
+    with _hs_lock:
+        if _hs_db is None:
+            db = hyperscan.Database()
+            db.compile(
+                expressions=[_hs_expression(pattern) for _, pattern, _ in INTENTS],
+                ids=list(range(len(INTENTS))),
+                elements=len(INTENTS),
+                flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SOM_LEFTMOST
+                       | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP] * len(INTENTS),
+            )
+            _hs_db = db
+    return _hs_db
+
+
+def _hyperscan_intent(message: str) -> Optional[str]:
+    """Leftmost intent via Hyperscan, ties going to the earlier intent (as `re`)."""
+    db = _hyperscan_db()
+    scratch = getattr(_hs_local, 'scratch', None)
+    if scratch is None:
+        scratch = _hs_local.scratch = hyperscan.Scratch(db)
+    data = message.encode()
+    candidates = []
+
+    def on_match(intent_id, start, end, flags, context):
+        candidates.append((start, intent_id))
+
+    db.scan(data, match_event_handler=on_match, scratch=scratch)
+    for start, intent_id in sorted(set(candidates)):
+        if _INTENT_PATTERNS[intent_id].match(message, len(data[:start].decode())):
+            return INTENTS[intent_id][0]
+    return None
+
 
 def respond(message: str) -> str:
-    for pattern, resp in RESPONSES:
-        if pattern.match(message):
-            return resp
+    if _HYPERSCAN_AVAILABLE:
+        intent = _hyperscan_intent(message)
+    else:
+        m = INTENT_RE.search(message)
+        intent = m.lastgroup if m else None
+    if intent:
+        return RESPONSES[intent]
     # fallback: echo with suggestion
-    return "I can help with appointments, triage advice, or hospital info. Please ask specifically."
+    return FALLBACK
 
 
 if __name__ == '__main__':
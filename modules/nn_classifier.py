@@ -2,6 +2,8 @@
 
 Demo for disease classification from simple features.
 """
+import functools
+
 import numpy as np
 
 # sklearn optional import to keep module importable in lightweight environments
@@ -17,7 +19,9 @@ except Exception:  # pragma: no cover - environment dependent
     _SKLEARN_AVAILABLE = False
 
 
+@functools.lru_cache(maxsize=1)
 def make_sample_data(n=200):
+    # cached (the seed is fixed); arrays are frozen since callers share them
     rng = np.random.RandomState(1)
     # features: fever (0/1), cough (0/1), wbc
     fever = rng.binomial(1, 0.2, size=n)
@@ -26,6 +30,8 @@ def make_sample_data(n=200):
     X = np.vstack([fever, cough, wbc]).T
     # label: disease A if fever and high wbc
     y = ((fever == 1) & (wbc > 9)).astype(int)
+    X.setflags(write=False)
+    y.setflags(write=False)
     return X, y
 
 
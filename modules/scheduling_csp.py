@@ -1,9 +1,115 @@
 """Simple CSP solver for staff and surgery scheduling (moved and renamed)
 
-This is a backtracking CSP with light constraint propagation (forward checking).
-It is intended as a clear, educational example.
+This is a backtracking CSP with AC-3 preprocessing, forward checking during
+search, MRV variable ordering and LCV value ordering. A staff member can only work one
+surgery at a time. It is intended as a clear, educational example.
 """
-from typing import List, Dict, Optional
+from collections import deque
+from itertools import combinations
+from typing import List, Dict, Optional, Set, Tuple
+
+# From this many surgeries up, hand the problem to CP-SAT when OR-Tools is
+# installed (imported only then: OR-Tools takes a while to load).
+CPSAT_MIN_SURGERIES = 15
+
+
+def _has_matching(options: List[List[str]], taken: Set[str] = frozenset()) -> bool:
+    """Whether every position can get a distinct staff id from its list in
+    `options`, none of them in `taken` (bipartite matching by augmenting
+    paths)."""
+    match = {}  # staff id -> index into options
+
+    def augment(i, seen):
+        for sid in options[i]:
+            if sid in seen or sid in taken:
+                continue
+            seen.add(sid)
+            if sid not in match or augment(match[sid], seen):
+                match[sid] = i
+                return True
+        return False
+
+    return all(augment(i, set()) for i in range(len(options)))
+
+
+def _can_staff(needs: List[Tuple[str, int]], staff: List[Dict]) -> bool:
+    """Whether every (role, duration) in `needs` can get a distinct staffer
+    holding that role with at least `duration` slots of capacity."""
+    return _has_matching([
+        [s['id'] for s in staff if role in s.get('roles', []) and s['max_slots'] >= length]
+        for role, length in needs
+    ])
+
+
+def _roles_result(team: List[Tuple[str, str]]) -> Dict:
+    """Public 'roles' mapping for a list of (role, staff id) picks: role ->
+    staff id, or role -> list of staff ids for a role the surgery needs more
+    than once."""
+    counts = {}
+    for role, _ in team:
+        counts[role] = counts.get(role, 0) + 1
+    roles = {}
+    for role, sid in team:
+        if counts[role] > 1:
+            roles.setdefault(role, []).append(sid)
+        else:
+            roles[role] = sid
+    return roles
+
+
+def _role_capacity_ok(surgeries: List[Dict], staff: List[Dict], duration: Dict[str, int],
+                      n_slots: int) -> bool:
+    """Relaxed global check: per role, the slot-hours surgeries need must not
+    exceed what staff holding that role could work in total. Multi-role staff
+    count toward each of their roles, so this never rejects a feasible input."""
+    supply = {}
+    for s in staff:
+        for r in s.get('roles', []):
+            supply[r] = supply.get(r, 0) + min(s['max_slots'], n_slots)
+    demand = {}
+    for sur in surgeries:
+        for r in sur['required_roles']:
+            demand[r] = demand.get(r, 0) + duration[sur['id']]
+    return all(need <= supply.get(r, 0) for r, need in demand.items())
+
+
+def _ac3(surgeries: List[Dict], staff: List[Dict], duration: Dict[str, int],
+         domains: Dict[str, Set[int]]) -> bool:
+    """Make start-slot domains arc consistent; False if one becomes empty.
+
+    Two surgeries conflict when their combined roles cannot be filled by
+    distinct staff, so they must not overlap in time. A start of one is
+    unsupported when every remaining start of a conflicting surgery overlaps
+    it. A surgery that cannot be staffed even on its own has no support at all.
+    """
+    needs = {sur['id']: [(r, duration[sur['id']]) for r in sur['required_roles']] for sur in surgeries}
+    for sur_id, need in needs.items():
+        if not _can_staff(need, staff):
+            domains[sur_id].clear()
+            return False
+    conflicts = {sur_id: [] for sur_id in needs}
+    for a, b in combinations(needs, 2):
+        if not _can_staff(needs[a] + needs[b], staff):
+            conflicts[a].append(b)
+            conflicts[b].append(a)
+
+    def window(sur_id, start):
+        return ((1 << duration[sur_id]) - 1) << start
+
+    def revise(a, b):
+        unsupported = [s for s in domains[a]
+                       if all(window(a, s) & window(b, t) for t in domains[b])]
+        domains[a].difference_update(unsupported)
+        return bool(unsupported)
+
+    queue = deque((a, b) for a in conflicts for b in conflicts[a])
+    while queue:
+        a, b = queue.popleft()
+        if revise(a, b):
+            if not domains[a]:
+                return False
+            queue.extend((c, a) for c in conflicts[a] if c != b)
+    return True
 
 
 def schedule_surgeries(staff: List[Dict], surgeries: List[Dict], slots: List[str]) -> Optional[Dict]:
@@ -13,66 +119,196 @@ def schedule_surgeries(staff: List[Dict], surgeries: List[Dict], slots: List[str
     surgeries: list of {'id', 'required_roles': ['surgeon','anesthetist'], 'duration_slots'}
     slots: list of slot identifiers (e.g., '08:00-09:00')
 
-    Returns assignment mapping or None.
+    Returns assignment mapping {surgery id: {'start': slot index, 'roles':
+    {role: staff id}}} or None. A role listed more than once in
+    'required_roles' maps to the list of staff ids filling it.
     """
+    if len(surgeries) >= CPSAT_MIN_SURGERIES:
+        from . import scheduling_cpsat
+        if scheduling_cpsat._ORTOOLS_AVAILABLE:
+            try:
+                return scheduling_cpsat.schedule_surgeries_cpsat(staff, surgeries, slots)
+            except scheduling_cpsat.CpSatError:
+                pass  # solve it with the backtracker below
+
     # Preprocess: map role -> available staff ids
     role_staff = {}
     for s in staff:
         for r in s.get("roles", []):
             role_staff.setdefault(r, []).append(s["id"])
 
-    # Simple domains: for each surgery, possible starting slot indices
-    max_start = len(slots)
-    domains = {sur['id']: list(range(0, max_start)) for sur in surgeries}
+    by_id = {sur['id']: sur for sur in surgeries}
+    duration = {sur['id']: sur.get('duration_slots', 1) for sur in surgeries}
+
+    # Domains: for each surgery, the start slot indices it still fits in.
+    # Unary constraints are applied up front: the surgery must fit before
+    # the last slot and every required role must have someone on the roster.
+    domains = {}
+    for sur in surgeries:
+        if all(role_staff.get(role) for role in sur['required_roles']):
+            domains[sur['id']] = set(range(0, len(slots) - duration[sur['id']] + 1))
+        else:
+            domains[sur['id']] = set()
 
     assignment = {}
     staff_load = {s['id']: 0 for s in staff}
+    # Busy slots per staffer as an int bitmask (bit k = slot k); a window of
+    # `length` slots from `start` is ((1 << length) - 1) << start.
+    staff_busy = {s['id']: 0 for s in staff}
+    all_slots = (1 << len(slots)) - 1
+    # Per role, the slots where at least one staffer of that role is free.
+    role_free = {r: all_slots for r in role_staff}
+    max_slots = {s['id']: s['max_slots'] for s in staff}
+    staff_roles = {s['id']: s.get('roles', []) for s in staff}
+    # Staff order breaks load ties, so the preferred team is deterministic.
+    rank = {s['id']: i for i, s in enumerate(staff)}
+    # (surgery id, start) pairs pruned by forward checking, for O(1) undo
+    trail = []
 
-    def consistent(sur_id, start_idx, sur):
-        # check if enough consecutive slots
-        if start_idx + sur.get('duration_slots', 1) > len(slots):
-            return False
-        # check staff availability for required roles
-        for role in sur['required_roles']:
-            available = role_staff.get(role, [])
-            if not available:
+    def eligible(role, window, length):
+        # staffers of `role` free for the whole window with room for `length`
+        # more slots, least-loaded first
+        return sorted((sid for sid in role_staff.get(role, ())
+                       if not staff_busy[sid] & window and staff_load[sid] + length <= max_slots[sid]),
+                      key=lambda sid: (staff_load[sid], rank[sid]))
+
+    def refresh_role_free(sid):
+        for r in staff_roles[sid]:
+            free = 0
+            for other in role_staff[r]:
+                free |= ~staff_busy[other]
+            role_free[r] = free & all_slots
+
+    def teams(sur_id, start):
+        """Every way to staff `sur_id` at `start`, as lists of (role, staff
+        id) pairs, least-loaded teams first. Staff are part of the search:
+        backtracking tries the next team before giving up on a start."""
+        length = duration[sur_id]
+        window = ((1 << length) - 1) << start
+        roles = by_id[sur_id]['required_roles']
+        # fast reject: some slot of the window has nobody free for a role
+        for role in roles:
+            if role_free.get(role, 0) & window != window:
+                return
+        options = [eligible(role, window, length) for role in roles]
+        team = []
+
+        def extend(k, taken):
+            if k == len(roles):
+                yield list(team)
+                return
+            tried = set()
+            for sid in options[k]:
+                # staffers with the same roles, cap, load and bookings are
+                # interchangeable from here on, so try only one of them
+                kind = (tuple(staff_roles[sid]), max_slots[sid], staff_load[sid], staff_busy[sid])
+                if sid in taken or kind in tried:
+                    continue
+                tried.add(kind)
+                taken.add(sid)
+                # only descend if the remaining roles can still be filled
+                if _has_matching(options[k + 1:], taken):
+                    team.append((roles[k], sid))
+                    yield from extend(k + 1, taken)
+                    team.pop()
+                taken.discard(sid)
+
+        seen = set()
+        for found in extend(0, set()):
+            # a role needed twice would otherwise yield each team per order
+            key = frozenset(found)
+            if key not in seen:
+                seen.add(key)
+                yield found
+
+    def choose_staff(sur_id, start):
+        return next(teams(sur_id, start), None)
+
+    def assign(sur_id, start, chosen):
+        assignment[sur_id] = {'start': start, 'team': chosen}
+        for _, sid in chosen:
+            staff_load[sid] += duration[sur_id]
+            staff_busy[sid] |= ((1 << duration[sur_id]) - 1) << start
+            refresh_role_free(sid)
+
+    def unassign(sur_id):
+        entry = assignment.pop(sur_id)
+        start = entry['start']
+        for _, sid in entry['team']:
+            staff_load[sid] -= duration[sur_id]
+            staff_busy[sid] &= ~(((1 << duration[sur_id]) - 1) << start)
+            refresh_role_free(sid)
+
+    def forward_check():
+        # prune start slots of unassigned surgeries that can no longer be
+        # staffed; returns False as soon as some domain empties
+        for sur_id, dom in domains.items():
+            if sur_id in assignment:
+                continue
+            for start in sorted(dom):
+                if choose_staff(sur_id, start) is None:
+                    dom.discard(start)
+                    trail.append((sur_id, start))
+            if not dom:
                 return False
         return True
 
-    def backtrack(i=0):
-        if i >= len(surgeries):
+    def undo_trail(mark):
+        while len(trail) > mark:
+            sur_id, start = trail.pop()
+            domains[sur_id].add(start)
+
+    def pruned_by(sur_id, start, chosen):
+        # LCV: how many values assigning `start` would remove from the others
+        mark = len(trail)
+        assign(sur_id, start, chosen)
+        forward_check()
+        count = len(trail) - mark
+        undo_trail(mark)
+        unassign(sur_id)
+        return count
+
+    # Remaining subproblems already shown unsolvable. The domains left at a
+    # node follow from the bookings so far (forward checking only removes
+    # starts that stay unstaffable as bookings grow), so unassigned
+    # surgeries plus per-staff busy masks and loads identify the subproblem.
+    failed = set()
+
+    def backtrack():
+        unassigned = [sur['id'] for sur in surgeries if sur['id'] not in assignment]
+        if not unassigned:
             return True
-        sur = surgeries[i]
-        for start in domains[sur['id']]:
-            if not consistent(sur['id'], start, sur):
-                continue
-            # naive: pick first staff for each role that still under max load
-            chosen = {}
-            ok = True
-            for role in sur['required_roles']:
-                for sid in role_staff.get(role, []):
-                    if staff_load[sid] + sur.get('duration_slots', 1) <= next(s['max_slots'] for s in staff if s['id'] == sid):
-                        chosen[role] = sid
-                        break
-                else:
-                    ok = False
-                    break
-            if not ok:
-                continue
-            # assign
-            assignment[sur['id']] = {'start': start, 'roles': chosen}
-            for sid in chosen.values():
-                staff_load[sid] += sur.get('duration_slots', 1)
-            if backtrack(i+1):
-                return True
-            # undo
-            del assignment[sur['id']]
-            for sid in chosen.values():
-                staff_load[sid] -= sur.get('duration_slots', 1)
+        state = (frozenset(unassigned), tuple(staff_busy.values()), tuple(staff_load.values()))
+        if state in failed:
+            return False
+        # MRV: branch on the surgery with the fewest remaining start slots
+        sur_id = min(unassigned, key=lambda sid: len(domains[sid]))
+        candidates = []
+        for start in sorted(domains[sur_id]):
+            chosen = choose_staff(sur_id, start)
+            if chosen is not None:
+                candidates.append((pruned_by(sur_id, start, chosen), start))
+        candidates.sort()
+        for _, start in candidates:
+            for chosen in teams(sur_id, start):
+                mark = len(trail)
+                assign(sur_id, start, chosen)
+                if forward_check() and backtrack():
+                    return True
+                undo_trail(mark)
+                unassign(sur_id)
+        failed.add(state)
         return False
 
+    if any(not dom for dom in domains.values()):
+        return None
+    if not _role_capacity_ok(surgeries, staff, duration, len(slots)):
+        return None
+    if not _ac3(surgeries, staff, duration, domains):
+        return None
     if backtrack():
-        return assignment
+        return {sur_id: {'start': entry['start'], 'roles': _roles_result(entry['team'])}
+                for sur_id, entry in assignment.items()}
     return None
 
 
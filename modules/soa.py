@@ -0,0 +1,97 @@
+"""Structure-of-arrays containers for beds and patients.
+
+The public functions across `modules` take the legacy list-of-dicts form;
+internally they convert once to these containers so hot loops run on flat
+NumPy arrays instead of per-attribute dict lookups. Callers that allocate
+repeatedly can build a container once and pass it in directly.
+"""
+from dataclasses import dataclass, field, fields
+from typing import List, Dict, Optional, Union
+
+import numpy as np
+
+from ._layout import pack_beds, pack_patients
+
+
+@dataclass(eq=False)
+class Beds:
+    """Bed attributes as parallel arrays, one entry per bed.
+
+    `records` holds the dict for each bed (the caller's own dicts when built
+    with `from_dicts`), so allocation results can be returned as dicts.
+    """
+    ids: List[str]
+    xy: np.ndarray
+    icu: np.ndarray
+    vent: np.ndarray
+    occupied: np.ndarray
+    records: Optional[List[Dict]] = field(default=None, repr=False)
+
+    @classmethod
+    def from_dicts(cls, beds: List[Dict]):
+        xy, icu, vent, occupied, ids = pack_beds(beds)
+        return cls(ids=ids, xy=xy, icu=icu, vent=vent, occupied=occupied, records=beds)
+
+    def to_dicts(self) -> List[Dict]:
+        return [
+            {'id': bid, 'is_occupied': bool(occ), 'icu': bool(icu), 'vent': bool(vent),
+             'location': tuple(loc)}
+            for bid, occ, icu, vent, loc in zip(self.ids, self.occupied, self.icu, self.vent, self.xy.tolist())
+        ]
+
+    @property
+    def beds(self) -> List[Dict]:
+        """Dict view of each bed, built once if the arrays came first."""
+        if self.records is None:
+            self.records = self.to_dicts()
+        return self.records
+
+    def mark_occupied(self, i: int, occupied: bool = True) -> None:
+        """Flip bed `i` in place, keeping its dict record in sync."""
+        self.occupied[i] = occupied
+        if self.records is not None:
+            self.records[i]['is_occupied'] = occupied
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+@dataclass(eq=False)
+class Patients:
+    """Patient requirements as parallel arrays, one entry per patient."""
+    ids: List[str]
+    xy: np.ndarray
+    needs_icu: np.ndarray
+    needs_vent: np.ndarray
+
+    @classmethod
+    def from_dicts(cls, patients: List[Dict]):
+        xy, needs_icu, needs_vent, ids = pack_patients(patients)
+        return cls(ids=ids, xy=xy, needs_icu=needs_icu, needs_vent=needs_vent)
+
+    def to_dicts(self) -> List[Dict]:
+        return [
+            {'id': pid, 'needs_icu': bool(icu), 'needs_vent': bool(vent), 'location': tuple(loc)}
+            for pid, icu, vent, loc in zip(self.ids, self.needs_icu, self.needs_vent, self.xy.tolist())
+        ]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+def as_beds(beds: Union[List[Dict], Beds], cls=Beds) -> Beds:
+    """Return `beds` as a `cls` instance, converting legacy lists once.
+
+    An existing Beds container is re-wrapped without copying its arrays.
+    """
+    if isinstance(beds, cls):
+        return beds
+    if isinstance(beds, Beds):
+        return cls(**{f.name: getattr(beds, f.name) for f in fields(Beds)})
+    return cls.from_dicts(beds)
+
+
+def as_patients(patients: Union[List[Dict], Patients]) -> Patients:
+    if isinstance(patients, Patients):
+        return patients
+    return Patients.from_dicts(patients)
@@ -1,23 +1,19 @@
 """Runner script demonstrating the modules quickly.
-Run: python run_demo.py
+Run: python run_demo.py [--only bed,triage] [--skip ml,nn]
+
+Each section imports its module on entry, so skipped sections never load
+their dependencies (scikit-learn for `ml` / `nn`).
 """
-from modules import (
-    bed_allocation,
-    scheduling_csp,
-    expert_system,
-    fuzzy_triage,
-    genetic_optimizer,
-    ml_predictor,
-    nn_classifier,
-    nlp_chatbot,
-)
-
-
-def demo():
-    print('='*60)
-    print('AI Hospital Resource Management System - Complete Demo')
-    print('='*60)
-    
+import argparse
+import importlib
+
+
+def _lazy(name):
+    return importlib.import_module(f'modules.{name}')
+
+
+def demo_bed():
+    bed_allocation = _lazy('bed_allocation')
     print('\n--- 1. Bed Allocation (A* Search) ---')
     patient = {'id': 'p1', 'needs_icu': True, 'needs_vent': False, 'location': (2,2)}
     beds = [
@@ -27,11 +23,17 @@ def demo():
     result = bed_allocation.allocate_bed(patient, beds)
     print(f'Patient {patient["id"]} allocated to bed: {result}')
 
+
+def demo_triage():
+    fuzzy_triage = _lazy('fuzzy_triage')
     print('\n--- 2. Patient Triage (Fuzzy Logic) ---')
     priority = fuzzy_triage.compute_priority(39.0, 130, 8)
     print(f'Patient vitals: Temp=39.0°C, BP=130, Pain=8/10')
     print(f'Computed priority score: {priority:.1f}/100 (higher = more urgent)')
-    
+
+
+def demo_schedule():
+    scheduling_csp = _lazy('scheduling_csp')
     print('\n--- 3. Staff & Surgery Scheduling (CSP Solver) ---')
     staff = [
         {'id': 's1', 'roles': ['surgeon'], 'max_slots': 4},
@@ -44,6 +46,9 @@ def demo():
     schedule = scheduling_csp.schedule_surgeries(staff, surgeries, slots)
     print(f'Surgery schedule: {schedule}')
 
+
+def demo_expert():
+    expert_system = _lazy('expert_system')
     print('\n--- 4. Medical Expert System (Rule-based Inference) ---')
     rules = [
         {'if': ['fever', 'cough'], 'then': ['possible_infection']},
@@ -57,6 +62,9 @@ def demo():
     print(f'Input symptoms: fever, cough, high_wbc')
     print(f'Expert system inferred: {es.facts}')
 
+
+def demo_ga():
+    genetic_optimizer = _lazy('genetic_optimizer')
     print('\n--- 5. Resource Optimization (Genetic Algorithm) ---')
     patients = [
         {'id': 'p1', 'needs_icu': True, 'needs_vent': False, 'location': (0,0)},
@@ -70,6 +78,9 @@ def demo():
     print(f'Optimal bed allocation: {allocation}')
     print(f'(chromosome: [bed_index for each patient, -1=unassigned])')
 
+
+def demo_ml():
+    ml_predictor = _lazy('ml_predictor')
     print('\n--- 6. Patient Admission Prediction (Machine Learning) ---')
     X, y = ml_predictor.make_sample_dataset()
     ap = ml_predictor.AdmissionPredictor()
@@ -79,6 +90,9 @@ def demo():
     pred = ap.predict([30, 39.0, 115, 9])
     print(f'Sample prediction (age=30, temp=39, sbp=115, pain=9): {"Admit" if pred else "Discharge"}')
 
+
+def demo_nn():
+    nn_classifier = _lazy('nn_classifier')
     print('\n--- 7. Disease Classification (Neural Network) ---')
     Xn, yn = nn_classifier.make_sample_data()
     nn = nn_classifier.NNClassifier()
@@ -86,16 +100,60 @@ def demo():
     print(f'MLP Neural Network trained on 200 samples')
     print(f'Test accuracy: {nn_acc:.2%}')
 
+
+def demo_chatbot():
+    nlp_chatbot = _lazy('nlp_chatbot')
     print('\n--- 8. Patient Query Chatbot (NLP) ---')
     queries = ['Hi there', 'I have a fever', 'I need an appointment']
     for q in queries:
         response = nlp_chatbot.respond(q)
         print(f'Q: {q}')
         print(f'A: {response}')
-    
+
+
+SECTIONS = {
+    'bed': demo_bed,
+    'triage': demo_triage,
+    'schedule': demo_schedule,
+    'expert': demo_expert,
+    'ga': demo_ga,
+    'ml': demo_ml,
+    'nn': demo_nn,
+    'chatbot': demo_chatbot,
+}
+
+
+def demo(only=None, skip=()):
+    selected = [name for name in SECTIONS if (only is None or name in only) and name not in skip]
+
+    print('='*60)
+    print('AI Hospital Resource Management System - Complete Demo')
+    print('='*60)
+
+    for name in selected:
+        SECTIONS[name]()
+
     print('\n' + '='*60)
-    print('Demo complete! All 8 AI modules demonstrated.')
+    if len(selected) == len(SECTIONS):
+        print(f'Demo complete! All {len(SECTIONS)} AI modules demonstrated.')
+    else:
+        print(f'Demo complete! {len(selected)} of {len(SECTIONS)} AI modules demonstrated.')
     print('='*60)
 
+
+def _section_list(value):
+    names = [v for v in value.split(',') if v]
+    unknown = sorted(set(names) - set(SECTIONS))
+    if unknown:
+        raise argparse.ArgumentTypeError(f'unknown section(s): {", ".join(unknown)} (choose from {", ".join(SECTIONS)})')
+    return names
+
+
 if __name__ == '__main__':
-    demo()
+    parser = argparse.ArgumentParser(description='Run the module demos')
+    parser.add_argument('--only', type=_section_list, default=None,
+                        help='Comma-separated sections to run (default: all)')
+    parser.add_argument('--skip', type=_section_list, default=[],
+                        help='Comma-separated sections to leave out')
+    args = parser.parse_args()
+    demo(only=args.only, skip=args.skip)
@@ -8,20 +8,36 @@ realistic distributions and seasonal patterns.
 Usage:
     python scripts/generate_patients.py --n 1000 --out data/patients_1000.csv --seed 42 --format csv
 
-Outputs CSV or JSON. Reproducible via --seed.
+Outputs CSV, JSON or Parquet. Parquet needs pyarrow (or fastparquet);
+without pyarrow, CSV is written by pandas. Reproducible via --seed.
 """
 from __future__ import annotations
 import argparse
+import importlib.util
 import csv
 import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
 import uuid
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple, Union
 import random
 
 import numpy as np
 import pandas as pd
-from faker import Faker
+
+# pyarrow is optional: its C++ writers are used for CSV/Parquet when present,
+# otherwise saving falls back to pandas.
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+    _PYARROW_AVAILABLE = True
+except Exception:  # pragma: no cover - environment dependent
+    pa = pc = pa_csv = pq = None
+    _PYARROW_AVAILABLE = False
 
 # --- Configuration / constants ---
 ICD10_EXAMPLE = [
@@ -52,6 +68,56 @@ MEDICATIONS_POOL = [
     "Aspirin", "Metformin", "Lisinopril", "Atorvastatin", "Amoxicillin",
     "Albuterol", "Warfarin", "Prednisone"
 ]
+# medications_mask bit i stands for MEDICATIONS_POOL[i]; the string column is
+# a lookup into all 256 possible masks rather than a per-row join.
+_MED_STRINGS = np.array(
+    [";".join(m for i, m in enumerate(MEDICATIONS_POOL) if mask >> i & 1) or "None" for mask in range(256)],
+    dtype=object,
+)
+RESPIRATORY_COMPLAINTS = ["Cough", "Shortness of breath", "Fever", "Sore throat"]
+RESPIRATORY_ICD10 = ["J10.1", "J18.9", "J06.9", "J45.9"]
+LOCATIONS = ["Ward A", "Ward B", "ICU", "ER", "Clinic"]
+ADMISSION_TYPE_P = np.array([0.5, 0.2, 0.1, 0.2])
+TRIAGE_P = np.array([0.05, 0.10, 0.35, 0.35, 0.15])  # levels 1..5
+# Storage dtypes for the bounded integer columns (ranges are enforced by the
+# clips in _generate_vectorized). The one-decimal measurements (temperature,
+# spo2, weight_kg, bmi) stay float64: in float32, 94.7 is 94.6999969..., which
+# leaks into JSON output and generate_one() records.
+NUMERIC_DTYPES = {
+    "age": np.int8,
+    "triage_level": np.int8,
+    "heart_rate": np.int16,
+    "bp_systolic": np.int16,
+    "bp_diastolic": np.int16,
+    "respiratory_rate": np.int8,
+    "pain_level": np.int8,
+    "height_cm": np.int16,
+}
+
+# Low-cardinality columns are stored as pandas categoricals: they are sampled
+# as integer codes into these fixed category lists, so strings are never
+# materialized per row and every shard shares one dtype (concat stays
+# categorical). Respiratory complaints/codes map into the general lists.
+_GENDER_DTYPE = pd.CategoricalDtype(GENDERS)
+_BLOOD_DTYPE = pd.CategoricalDtype(BLOOD_TYPES)
+_ADM_DTYPE = pd.CategoricalDtype(ADMISSION_TYPES)
+_INSURANCE_DTYPE = pd.CategoricalDtype(INSURANCE_PROVIDERS)
+_ALLERGY_DTYPE = pd.CategoricalDtype(ALLERGIES_POOL)
+_LOCATION_DTYPE = pd.CategoricalDtype(LOCATIONS)
+_COMPLAINT_DTYPE = pd.CategoricalDtype(list(dict.fromkeys(CHIEF_COMPLAINTS + RESPIRATORY_COMPLAINTS)))
+_ICD10_DTYPE = pd.CategoricalDtype(list(dict.fromkeys(ICD10_EXAMPLE + RESPIRATORY_ICD10)))
+_RESP_COMPLAINT_CODES = _COMPLAINT_DTYPE.categories.get_indexer(RESPIRATORY_COMPLAINTS)
+_RESP_ICD10_CODES = _ICD10_DTYPE.categories.get_indexer(RESPIRATORY_ICD10)
+
+# generate_n works in fixed-size, independently seeded shards; process-pool
+# startup only pays off for large runs.
+SHARD_SIZE = 10_000
+PARALLEL_MIN_N = 10_000
+
+# Canned free-text notes, drawn with Zipf-like weights (a few recur often)
+NOTES_POOL_SIZE = 256
+_NOTES_P = 1.0 / np.arange(1, NOTES_POOL_SIZE + 1)
+_NOTES_P /= _NOTES_P.sum()
 
 # --- Helpers ---
 def seasonality_multiplier(adm_dt: datetime, base_rate: float, condition: str) -> float:
@@ -70,100 +136,147 @@ def seasonality_multiplier(adm_dt: datetime, base_rate: float, condition: str) -
 def clip(val, low, high):
     return max(low, min(high, val))
 
+# Faker is only used to fill a fixed pool of strings once per process;
+# records then draw from the pool by index with the run's RNG.
+STRING_POOL_SIZE = 1024
+_POOL: Optional[Dict[str, np.ndarray]] = None
+
+def _string_pool() -> Dict[str, np.ndarray]:
+    global _POOL
+    if _POOL is None:
+        from faker import Faker
+
+        fake = Faker()
+        fake.seed_instance(0)
+
+        def sample(method, size=STRING_POOL_SIZE, **kwargs):
+            return np.array([method(**kwargs) for _ in range(size)], dtype=object)
+
+        _POOL = {
+            "first_name": sample(fake.first_name),
+            "last_name": sample(fake.last_name),
+            "city": sample(fake.city),
+            "zip_code": sample(fake.postcode),
+            "emergency_contact": sample(fake.phone_number),
+            "notes": sample(fake.sentence, NOTES_POOL_SIZE, nb_words=10),
+        }
+    return _POOL
+
+def _anchor_now() -> datetime:
+    """Reference "now" for a whole run (today's midnight) so dates derived
+    from it do not drift between records or between runs on the same day."""
+    return datetime.combine(datetime.now().date(), datetime.min.time())
+
 # --- Core generator ---
-def generate_one(fake: Faker, seed_for_record: Optional[int] = None) -> Dict[str, Any]:
-    if seed_for_record is not None:
-        random.seed(seed_for_record)
-        np.random.seed(seed_for_record)
+def _generate_vectorized(n: int, seed: Union[int, np.random.SeedSequence]) -> pd.DataFrame:
+    """Generate `n` records with whole-column NumPy draws from one seeded RNG."""
+    rng = np.random.default_rng(seed)
+    now = _anchor_now()
+    pools = _string_pool()
+
+    def draw(pool: np.ndarray) -> np.ndarray:
+        return pool[rng.integers(0, len(pool), n)]
+
+    def draw_codes(k: int) -> np.ndarray:
+        return rng.integers(0, k, n)
+
+    def categorical(codes: np.ndarray, dtype: pd.CategoricalDtype) -> pd.Categorical:
+        return pd.Categorical.from_codes(codes, dtype=dtype)
 
     # Demographics
-    first_name = fake.first_name()
-    last_name = fake.last_name()
-    patient_id = str(uuid.uuid5(uuid.NAMESPACE_DNS, f"{seed_for_record}"))
-    gender = random.choice(GENDERS)
-    blood_type = random.choice(BLOOD_TYPES)
+    first_name = draw(pools["first_name"])
+    last_name = draw(pools["last_name"])
+    # Random (version 4) UUIDs from the seeded RNG; no per-record hashing
+    id_bytes = rng.bytes(16 * n)
+    patient_id = [str(uuid.UUID(bytes=id_bytes[i:i + 16], version=4)) for i in range(0, 16 * n, 16)]
+    gender = categorical(draw_codes(len(GENDERS)), _GENDER_DTYPE)
+    blood_type = categorical(draw_codes(len(BLOOD_TYPES)), _BLOOD_DTYPE)
 
     # Age distribution: Normal(mean=45, std=20), clipped to [0, 100]
-    age = int(clip(int(np.random.normal(45, 20)), 0, 100))
+    age = np.clip(rng.normal(45, 20, n).astype(np.int64), 0, 100)
     # DOB from age +/- 364 days
-    dob = (datetime.now() - timedelta(days=age * 365 + random.randint(0, 364))).date().isoformat()
+    dob_days = age * 365 + rng.integers(0, 365, n)
+    dob = np.datetime_as_string(np.datetime64(now.date()) - dob_days.astype("timedelta64[D]"), unit="D")
 
     # Admission datetime with seasonality (over past 3 years)
-    start = datetime.now() - timedelta(days=365*3)
-    end = datetime.now()
-    total_seconds = int((end - start).total_seconds())
-    adm_dt = start + timedelta(seconds=random.randint(0, total_seconds))
+    start = now - timedelta(days=365*3)
+    total_seconds = int((now - start).total_seconds())
+    adm_offsets = rng.integers(0, total_seconds + 1, n)
+    adm_dt = pd.Timestamp(start) + pd.to_timedelta(adm_offsets, unit="s")
 
     # Admission type and triage
-    admission_type = np.random.choice(ADMISSION_TYPES, p=[0.5, 0.2, 0.1, 0.2])
-    triage_level = int(clip(int(np.random.choice([1,2,3,4,5], p=[0.05,0.10,0.35,0.35,0.15])), 1, 5))
+    admission_type = categorical(rng.choice(len(ADMISSION_TYPES), n, p=ADMISSION_TYPE_P), _ADM_DTYPE)
+    triage_level = rng.choice(len(TRIAGE_P), n, p=TRIAGE_P) + 1
 
     # Vitals with age-appropriate distributions
     # Temperature: Normal(37.0, 0.5) but create fever cases (~5-8%)
-    base_temp = np.random.normal(37.0, 0.5)
-    if random.random() < 0.07:
-        temp = round(base_temp + np.random.uniform(1.0, 3.5), 1)  # fever
-    else:
-        temp = round(base_temp, 1)
+    base_temp = rng.normal(37.0, 0.5, n)
+    fever = rng.random(n) < 0.07
+    temp = np.where(fever, base_temp + rng.uniform(1.0, 3.5, n), base_temp).round(1)
     # Heart rate: Normal(75, 12) but slightly higher for younger/fever
-    hr = int(clip(int(np.random.normal(75 + (100-age)/100*3 + (temp>38)*10, 12)), 30, 200))
+    hr = np.clip(rng.normal(75 + (100 - age) / 100 * 3 + (temp > 38) * 10, 12).astype(np.int64), 30, 200)
     # Respiratory rate: Normal(16, 3)
-    rr = int(clip(int(np.random.normal(16, 3)), 8, 40))
+    rr = np.clip(rng.normal(16, 3, n).astype(np.int64), 8, 40)
     # SpO2: Normal(97,1.5) but lower if respiratory issue
-    spo2 = round(clip(np.random.normal(97, 1.5), 70, 100), 1)
+    spo2 = np.clip(rng.normal(97, 1.5, n), 70, 100).round(1)
     # Weight/Height/BMI
-    height_cm = int(clip(int(np.random.normal(168, 10)), 120, 210))
-    weight_kg = round(clip(np.random.normal(70 + (age-45)*0.1, 15), 30, 200), 1)
-    bmi = round(weight_kg / ((height_cm/100)**2), 1)
+    height_cm = np.clip(rng.normal(168, 10, n).astype(np.int64), 120, 210)
+    weight_kg = np.clip(rng.normal(70 + (age - 45) * 0.1, 15), 30, 200).round(1)
+    bmi = (weight_kg / (height_cm / 100) ** 2).round(1)
 
     # BP correlated with age and hypertension prevalence
     # Baseline systolic around 110-120, increases with age and with some chance of hypertension
-    htn_prob = clip(0.05 + 0.01 * max(age - 40, 0), 0, 0.6)  # increases after 40
-    has_htn = random.random() < htn_prob
-    bp_systolic = int(clip(int(np.random.normal(115 + 0.6*age + (has_htn*10), 15)), 80, 240))
-    bp_diastolic = int(clip(int(np.random.normal(75 + 0.2*age + (has_htn*5), 10)), 40, 140))
+    htn_prob = np.clip(0.05 + 0.01 * np.maximum(age - 40, 0), 0, 0.6)  # increases after 40
+    has_htn = rng.random(n) < htn_prob
+    bp_systolic = np.clip(rng.normal(115 + 0.6 * age + has_htn * 10, 15).astype(np.int64), 80, 240)
+    bp_diastolic = np.clip(rng.normal(75 + 0.2 * age + has_htn * 5, 10).astype(np.int64), 40, 140)
 
     # Pain level 0-10 (higher for traumatic/admissions)
-    pain_level = int(clip(int(np.random.normal(3 + (triage_level<=2)*3, 2)), 0, 10))
+    pain_level = np.clip(rng.normal(3 + (triage_level <= 2) * 3, 2).astype(np.int64), 0, 10)
 
     # Allergies, medications, medical history
-    allergies = random.choice(ALLERGIES_POOL)
-    meds = random.sample(MEDICATIONS_POOL, k=random.choice([0,1,1,2]))
-    medical_history = []
+    allergies = categorical(draw_codes(len(ALLERGIES_POOL)), _ALLERGY_DTYPE)
+    # k distinct medications per row = the k smallest of 8 random keys
+    med_counts = rng.choice([0, 1, 1, 2], n)
+    med_rank = rng.random((n, len(MEDICATIONS_POOL))).argsort(axis=1).argsort(axis=1)
+    meds_mask = ((med_rank < med_counts[:, None]) << np.arange(len(MEDICATIONS_POOL))).sum(axis=1).astype(np.uint8)
     # Add some chronic conditions probabilistically
-    if random.random() < 0.25:
-        medical_history.append("Hypertension")
-    if random.random() < 0.20:
-        medical_history.append("Diabetes")
-    if random.random() < 0.10:
-        medical_history.append("COPD")
-    if random.random() < 0.08:
-        medical_history.append("Coronary artery disease")
-    medical_history_text = ";".join(medical_history) if medical_history else "None"
+    history_draws = rng.random((n, 4)) < [0.25, 0.20, 0.10, 0.08]
+    history_names = ["Hypertension", "Diabetes", "COPD", "Coronary artery disease"]
+    history_strings = np.array(
+        [";".join(name for i, name in enumerate(history_names) if mask >> i & 1) or "None" for mask in range(16)],
+        dtype=object,
+    )
+    medical_history = history_strings[history_draws @ (1 << np.arange(4))]
 
     # Chief complaint & diagnosis: include seasonal spike for respiratory/flu codes
     # Create probability for respiratory cases higher in winter months
-    resp_multiplier = seasonality_multiplier(adm_dt, 1.0, "respiratory")
-    if random.random() < 0.12 * resp_multiplier:
-        # respiratory complaint & ICD10
-        chief = random.choice(["Cough", "Shortness of breath", "Fever", "Sore throat"])
-        diagnosis_icd10 = random.choice(["J10.1", "J18.9", "J06.9", "J45.9"])
-    else:
-        chief = random.choice(CHIEF_COMPLAINTS)
-        diagnosis_icd10 = random.choice(ICD10_EXAMPLE)
+    by_month = np.array([seasonality_multiplier(datetime(2000, m, 1), 1.0, "respiratory") for m in range(1, 13)])
+    resp_multiplier = by_month[adm_dt.month.to_numpy() - 1]
+    respiratory = rng.random(n) < 0.12 * resp_multiplier
+    chief = categorical(np.where(
+        respiratory,
+        _RESP_COMPLAINT_CODES[draw_codes(len(RESPIRATORY_COMPLAINTS))],
+        draw_codes(len(CHIEF_COMPLAINTS)),
+    ), _COMPLAINT_DTYPE)
+    diagnosis_icd10 = categorical(np.where(
+        respiratory,
+        _RESP_ICD10_CODES[draw_codes(len(RESPIRATORY_ICD10))],
+        draw_codes(len(ICD10_EXAMPLE)),
+    ), _ICD10_DTYPE)
 
     # Admission and discharge timestamps: length of stay 0-30 days skewed toward short stays
-    los_days = int(clip(int(np.random.exponential(2.5)), 0, 30))
-    discharge_dt = adm_dt + timedelta(days=los_days, seconds=random.randint(0, 86400))
+    los_days = np.clip(rng.exponential(2.5, n).astype(np.int64), 0, 30)
+    discharge_dt = adm_dt + pd.to_timedelta(los_days * 86400 + rng.integers(0, 86401, n), unit="s")
 
     # Location/demographics
-    city = fake.city()
-    zip_code = fake.postcode()
-    insurance_provider = random.choice(INSURANCE_PROVIDERS)
-    emergency_contact = fake.phone_number()
-    location = random.choice(["Ward A", "Ward B", "ICU", "ER", "Clinic"])
+    city = draw(pools["city"])
+    zip_code = draw(pools["zip_code"])
+    insurance_provider = categorical(draw_codes(len(INSURANCE_PROVIDERS)), _INSURANCE_DTYPE)
+    emergency_contact = draw(pools["emergency_contact"])
+    location = categorical(draw_codes(len(LOCATIONS)), _LOCATION_DTYPE)
 
-    record = {
+    df = pd.DataFrame({
         "patient_id": patient_id,
         "first_name": first_name,
         "last_name": last_name,
@@ -171,8 +284,8 @@ def generate_one(fake: Faker, seed_for_record: Optional[int] = None) -> Dict[str
         "age": age,
         "gender": gender,
         "blood_type": blood_type,
-        "admission_datetime": adm_dt.isoformat(timespec='seconds'),
-        "discharge_datetime": discharge_dt.isoformat(timespec='seconds'),
+        "admission_datetime": adm_dt.to_numpy().astype("datetime64[s]"),
+        "discharge_datetime": discharge_dt.to_numpy().astype("datetime64[s]"),
         "chief_complaint": chief,
         "triage_level": triage_level,
         "temperature": temp,
@@ -186,8 +299,9 @@ def generate_one(fake: Faker, seed_for_record: Optional[int] = None) -> Dict[str
         "height_cm": height_cm,
         "bmi": bmi,
         "allergies": allergies,
-        "medications": ";".join(meds) if meds else "None",
-        "medical_history": medical_history_text,
+        "medications": decode_meds(meds_mask),
+        "medications_mask": meds_mask,
+        "medical_history": medical_history,
         "insurance_provider": insurance_provider,
         "emergency_contact": emergency_contact,
         "diagnosis_icd10": diagnosis_icd10,
@@ -196,34 +310,93 @@ def generate_one(fake: Faker, seed_for_record: Optional[int] = None) -> Dict[str
         "city": city,
         "zip_code": zip_code,
         # Add a short free-text note (synthetic)
-        "notes": fake.sentence(nb_words=10),
-    }
+        "notes": pools["notes"][rng.choice(NOTES_POOL_SIZE, n, p=_NOTES_P)],
+    })
+    return df.astype(NUMERIC_DTYPES)
 
+def decode_meds(mask: Any) -> Any:
+    """';'-joined medication names for a `medications_mask` value or array ("None" when empty)."""
+    return _MED_STRINGS[np.asarray(mask, dtype=np.uint8)]
+
+def generate_one(fake: Any = None, seed_for_record: Optional[int] = None) -> Dict[str, Any]:
+    """Single record; thin wrapper over the vectorized generator.
+
+    `fake` is accepted for backwards compatibility and ignored: names and
+    places come from the shared string pool. Timestamps are returned as ISO
+    strings ("2025-09-24T11:47:42"), as before the vectorized generator.
+    """
+    seed = seed_for_record if seed_for_record is not None else random.randrange(2**32)
+    record = _generate_vectorized(1, seed).iloc[0].to_dict()
+    for col in ("admission_datetime", "discharge_datetime"):
+        record[col] = record[col].isoformat(timespec="seconds")
     return record
 
-def generate_n(n: int = 1000, seed: int = 42) -> pd.DataFrame:
-    fake = Faker()
-    Faker.seed(seed)
-    random.seed(seed)
-    np.random.seed(seed)
+def _generate_shard(shard: Tuple[int, np.random.SeedSequence]) -> pd.DataFrame:
+    size, shard_seed = shard
+    return _generate_vectorized(size, shard_seed)
 
-    rows: List[Dict[str, Any]] = []
-    for i in range(n):
-        # For reproducibility and variety, derive a per-record seed
-        rec_seed = seed + i
-        rows.append(generate_one(fake, seed_for_record=rec_seed))
+def generate_n(n: int = 1000, seed: int = 42, workers: int = 1) -> pd.DataFrame:
+    """Generate `n` records in shards of SHARD_SIZE.
 
-    df = pd.DataFrame(rows)
+    Shard i draws from child i of `SeedSequence(seed)`: streams are
+    independent of each other and of other seeds' shards (unlike `seed + i`,
+    where seed 42's second shard would replay seed 10042's first). Output
+    depends only on (n, seed) and never on `workers`. With workers > 1, runs
+    of at least PARALLEL_MIN_N records are spread over a process pool.
+    """
+    sizes = [min(SHARD_SIZE, n - lo) for lo in range(0, n, SHARD_SIZE)] or [0]
+    shards = list(zip(sizes, np.random.SeedSequence(seed).spawn(len(sizes))))
+    if workers > 1 and n >= PARALLEL_MIN_N and len(shards) > 1:
+        # spawn: forking a process whose thread pools (Numba, BLAS) are
+        # running can deadlock the child or the parent's shutdown
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=min(workers, len(shards)), mp_context=ctx) as pool:
+            parts = list(pool.map(_generate_shard, shards))
+    else:
+        parts = [_generate_shard(shard) for shard in shards]
+    df = parts[0] if len(parts) == 1 else pd.concat(parts, ignore_index=True)
 
     # Make sure required fields exist and drop duplicates if any (shouldn't)
     df = df.drop_duplicates(subset=["patient_id"])
     return df
 
+def _pandas_csv_table(table: Any) -> Any:
+    """Format float columns the way `DataFrame.to_csv` does.
+
+    Arrow writes integral floats without a fraction ("97"); pandas writes
+    repr() ("97.0"). The two agree otherwise for the magnitudes generated
+    here (no exponent notation below 1e-4 or at/above 1e16).
+    """
+    for i, field in enumerate(table.schema):
+        if pa.types.is_floating(field.type):
+            text = pc.cast(table.column(i), pa.string())
+            bare = pc.invert(pc.match_substring_regex(text, "[.en]"))
+            text = pc.if_else(bare, pc.binary_join_element_wise(text, ".0", ""), text)
+            table = table.set_column(i, field.name, text)
+    return table
+
 def save(df: pd.DataFrame, out_path: str, fmt: str = "csv"):
-    if fmt == "csv":
+    if fmt == "csv" and _PYARROW_AVAILABLE:
+        # Unquoted output is byte-identical to the pandas writer; a field that
+        # needs quoting makes Arrow refuse, and pandas writes the file instead.
+        table = _pandas_csv_table(pa.Table.from_pandas(df, preserve_index=False))
+        try:
+            # Arrow always quotes the header row, so it is written here instead
+            with open(out_path, "w", newline="") as f:
+                csv.writer(f, lineterminator="\n").writerow(table.column_names)
+            with open(out_path, "ab") as f:
+                pa_csv.write_csv(table, f, pa_csv.WriteOptions(include_header=False, quoting_style="none"))
+            return
+        except pa.ArrowInvalid:
+            pass
+    if fmt == "parquet" and _PYARROW_AVAILABLE:
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), out_path, compression="zstd")
+    elif fmt == "csv":
         df.to_csv(out_path, index=False)
+    elif fmt == "parquet":
+        df.to_parquet(out_path, index=False)
     elif fmt == "json":
-        df.to_json(out_path, orient="records", date_format="iso", indent=2)
+        df.to_json(out_path, orient="records", date_format="iso", date_unit="s", indent=2)
     else:
         raise ValueError("Unsupported format: " + fmt)
 
@@ -232,10 +405,14 @@ def cli_main():
     parser.add_argument("--n", type=int, default=1000, help="Number of records to generate")
     parser.add_argument("--seed", type=int, default=42, help="Random seed for reproducibility")
     parser.add_argument("--out", type=str, default="data/patients_1000.csv", help="Output path")
-    parser.add_argument("--format", choices=["csv", "json"], default="csv", help="Output file format")
+    parser.add_argument("--format", choices=["csv", "json", "parquet"], default="csv", help="Output file format")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="Worker processes for large runs (output does not depend on this)")
     args = parser.parse_args()
+    if args.format == "parquet" and not (_PYARROW_AVAILABLE or importlib.util.find_spec("fastparquet")):
+        parser.error("--format parquet needs pyarrow (or fastparquet) installed")
 
-    df = generate_n(n=args.n, seed=args.seed)
+    df = generate_n(n=args.n, seed=args.seed, workers=args.workers)
     save(df, args.out, fmt=args.format)
     print(f"Wrote {len(df)} records to {args.out}")
 
@@ -6,15 +6,19 @@ Tests cover:
 3. Error handling
 4. Integration scenarios
 """
+import numpy as np
 import pytest
 from modules import (
     bed_allocation,
+    fastcore,
     scheduling_csp,
     expert_system,
     fuzzy_triage,
     genetic_optimizer,
+    geometry,
     nlp_chatbot
 )
+from agents.intelligent_agent import HospitalAgent
 
 
 class TestBedAllocation:
@@ -47,6 +51,102 @@ class TestBedAllocation:
         # Should prefer ICU bed despite distance
         assert result['icu'] == True
 
+    def test_bed_pool_matches_dict_list(self):
+        patient = {'id': 'p1', 'needs_icu': True, 'needs_vent': True, 'location': (2, 2)}
+        beds = [
+            {'id': 'b1', 'is_occupied': True, 'icu': True, 'vent': True, 'location': (2, 2)},
+            {'id': 'b2', 'is_occupied': False, 'icu': True, 'vent': False, 'location': (3, 2)},
+            {'id': 'b3', 'is_occupied': False, 'icu': True, 'vent': True, 'location': (9, 9)},
+        ]
+        pool = bed_allocation.BedPool.from_dicts(beds)
+        result = bed_allocation.allocate_bed(patient, pool)
+        assert result is beds[2]
+        assert result is bed_allocation.allocate_bed(patient, beds)
+    
+    def test_fractional_locations(self):
+        beds = [
+            {'id': 'a', 'is_occupied': False, 'icu': False, 'vent': False, 'location': (0.4, 0)},
+            {'id': 'b', 'is_occupied': False, 'icu': False, 'vent': False, 'location': (0.6, 0)},
+        ]
+        assert bed_allocation.allocate_bed({'id': 'p1', 'location': (0.9, 0)}, beds)['id'] == 'b'
+        with pytest.raises(ValueError):
+            bed_allocation.allocate_bed({'id': 'p1', 'location': (0, 0)}, beds + [{'id': 'c', 'location': ('x', 0)}])
+
+    def test_mark_occupied_syncs_records(self):
+        beds = [{'id': 'b1', 'is_occupied': False, 'icu': False, 'vent': False, 'location': (0, 0)}]
+        pool = bed_allocation.BedPool.from_dicts(beds)
+        pool.mark_occupied(0)
+        assert beds[0]['is_occupied'] is True
+        assert pool.select({'needs_icu': False, 'needs_vent': False, 'location': (0, 0)}) == -1
+
+    @staticmethod
+    def _baseline_select(patient, beds):
+        # full scoring over every open bed, lowest index on ties
+        best, best_score = -1, None
+        for i, bed in enumerate(beds):
+            if bed['is_occupied']:
+                continue
+            score = bed_allocation.manhattan(patient['location'], bed['location'])
+            score += bed_allocation.MISSING_FEATURE_PENALTY * (
+                (patient.get('needs_icu', False) and not bed['icu'])
+                + (patient.get('needs_vent', False) and not bed['vent']))
+            if best_score is None or score < best_score:
+                best, best_score = i, score
+        return best
+
+    @pytest.mark.parametrize('use_fastcore', [True, False])
+    def test_matched_bed_fast_path(self, monkeypatch, use_fastcore):
+        if use_fastcore and not fastcore.FASTCORE_AVAILABLE:
+            pytest.skip('fastcore extension not built')
+        monkeypatch.setattr(fastcore, 'FASTCORE_AVAILABLE', use_fastcore)
+        penalty = bed_allocation.MISSING_FEATURE_PENALTY
+        patient = {'id': 'p1', 'needs_icu': True, 'needs_vent': False, 'location': (0, 0)}
+
+        def bed(i, icu, x):
+            return {'id': f'b{i}', 'is_occupied': False, 'icu': icu, 'vent': False, 'location': (x, 0)}
+
+        cases = [
+            # matched bed just inside the penalty wins outright
+            ([bed(0, False, 0), bed(1, True, penalty - 1)], 1),
+            # exactly at the penalty it ties a feature-missing bed: lowest index wins
+            ([bed(0, False, 0), bed(1, True, penalty)], 0),
+            ([bed(0, True, penalty), bed(1, False, 0)], 0),
+            # every matched bed beyond the penalty: fall back to a missing-feature bed
+            ([bed(0, True, penalty + 50), bed(1, False, 10), bed(2, True, penalty + 20)], 1),
+        ]
+        for beds, expected in cases:
+            assert self._baseline_select(patient, beds) == expected
+            pool = bed_allocation.BedPool.from_dicts(beds)
+            assert pool.select(patient) == expected
+            dist = geometry.pairwise_manhattan([patient['location']], pool.xy)[0]
+            assert pool.select(patient, dist=dist) == expected
+
+        rng = np.random.default_rng(4)
+        for _ in range(200):
+            beds = [{'id': f'b{i}', 'is_occupied': bool(rng.random() < 0.3), 'icu': bool(rng.random() < 0.4),
+                     'vent': bool(rng.random() < 0.4), 'location': tuple(rng.integers(0, 160, 2).tolist())}
+                    for i in range(int(rng.integers(1, 12)))]
+            patient = {'id': 'p', 'needs_icu': bool(rng.random() < 0.5), 'needs_vent': bool(rng.random() < 0.5),
+                       'location': tuple(rng.integers(0, 160, 2).tolist())}
+            pool = bed_allocation.BedPool.from_dicts(beds)
+            assert pool.select(patient) == self._baseline_select(patient, beds)
+
+
+class TestGeometry:
+    """Tests for pairwise distance helpers"""
+    
+    def test_pairwise_manhattan(self):
+        pat_xy = [(0, 0), (5, 5)]
+        bed_xy = [(1, 0), (6, 6), (-3, 4)]
+        dist = geometry.pairwise_manhattan(pat_xy, bed_xy)
+        assert dist.shape == (2, 3)
+        assert dist.tolist() == [[1, 12, 7], [9, 2, 9]]
+    
+    def test_pairwise_manhattan_large_grid(self):
+        # coordinates outside the int8 fast path must not overflow
+        dist = geometry.pairwise_manhattan([(-100, 0)], [(100, 300)])
+        assert dist.tolist() == [[500]]
+
 
 class TestSchedulingCSP:
     """Tests for CSP scheduling module"""
@@ -76,6 +176,132 @@ class TestSchedulingCSP:
         # Should fail - missing anesthetist
         assert result is None
 
+    def test_balances_staff_load(self):
+        staff = [
+            {'id': 's1', 'roles': ['surgeon'], 'max_slots': 4},
+            {'id': 's2', 'roles': ['surgeon'], 'max_slots': 4},
+        ]
+        surgeries = [
+            {'id': 'op1', 'required_roles': ['surgeon'], 'duration_slots': 1},
+            {'id': 'op2', 'required_roles': ['surgeon'], 'duration_slots': 1},
+        ]
+        result = scheduling_csp.schedule_surgeries(staff, surgeries, ['08:00', '09:00'])
+        assert result is not None
+        surgeons = {result[op]['roles']['surgeon'] for op in ('op1', 'op2')}
+        assert surgeons == {'s1', 's2'}
+
+    def test_staff_not_double_booked(self):
+        staff = [{'id': 's1', 'roles': ['surgeon'], 'max_slots': 4}]
+        surgeries = [
+            {'id': 'op1', 'required_roles': ['surgeon'], 'duration_slots': 1},
+            {'id': 'op2', 'required_roles': ['surgeon'], 'duration_slots': 1},
+        ]
+        result = scheduling_csp.schedule_surgeries(staff, surgeries, ['08:00', '09:00'])
+        assert result is not None
+        assert result['op1']['start'] != result['op2']['start']
+        # only one slot for two surgeries with a single surgeon
+        assert scheduling_csp.schedule_surgeries(staff, surgeries, ['08:00']) is None
+
+    def test_repeated_role_keeps_every_pick(self):
+        staff = [
+            {'id': 'x', 'roles': ['nurse'], 'max_slots': 4},
+            {'id': 'y', 'roles': ['nurse'], 'max_slots': 4},
+        ]
+        surgeries = [
+            {'id': 'o', 'required_roles': ['nurse', 'nurse'], 'duration_slots': 1},
+            {'id': 'p', 'required_roles': ['nurse'], 'duration_slots': 1},
+        ]
+        result = scheduling_csp.schedule_surgeries(staff, surgeries, ['08:00', '09:00'])
+        assert sorted(result['o']['roles']['nurse']) == ['x', 'y']
+        # both nurses are busy during 'o', so 'p' must take the other slot
+        assert result['p']['start'] != result['o']['start']
+        assert scheduling_csp.schedule_surgeries(staff, surgeries, ['08:00']) is None
+
+    def test_staff_choice_is_revisited(self):
+        # 'a' is the least-loaded nurse for op0, but op1 then has no anesthetist
+        staff = [
+            {'id': 'a', 'roles': ['nurse', 'anesthetist'], 'max_slots': 4},
+            {'id': 'b', 'roles': ['nurse'], 'max_slots': 4},
+            {'id': 'c', 'roles': ['anesthetist'], 'max_slots': 4},
+            {'id': 'd', 'roles': ['nurse'], 'max_slots': 4},
+        ]
+        surgeries = [
+            {'id': 'op0', 'required_roles': ['nurse', 'anesthetist'], 'duration_slots': 1},
+            {'id': 'op1', 'required_roles': ['nurse', 'anesthetist'], 'duration_slots': 1},
+        ]
+        result = scheduling_csp.schedule_surgeries(staff, surgeries, ['08:00'])
+        assert result is not None
+        used = [sid for op in result.values() for sid in op['roles'].values()]
+        assert sorted(used) == sorted(set(used))
+        assert {result['op0']['roles']['anesthetist'], result['op1']['roles']['anesthetist']} == {'a', 'c'}
+
+    def test_cpsat_backend(self):
+        pytest.importorskip('ortools')
+        from modules import scheduling_cpsat
+        staff = [
+            {'id': 's1', 'roles': ['surgeon'], 'max_slots': 4},
+            {'id': 's2', 'roles': ['anesthetist'], 'max_slots': 4},
+        ]
+        surgeries = [
+            {'id': 'op1', 'required_roles': ['surgeon', 'anesthetist'], 'duration_slots': 2},
+            {'id': 'op2', 'required_roles': ['surgeon', 'anesthetist'], 'duration_slots': 2},
+        ]
+        result = scheduling_cpsat.schedule_surgeries_cpsat(staff, surgeries, ['08:00', '09:00', '10:00', '11:00'])
+        assert result is not None
+        assert abs(result['op1']['start'] - result['op2']['start']) >= 2
+        assert scheduling_cpsat.schedule_surgeries_cpsat(staff, surgeries, ['08:00', '09:00']) is None
+        # a role needed twice takes two different staffers
+        staff.append({'id': 's3', 'roles': ['anesthetist'], 'max_slots': 4})
+        twice = [{'id': 'op3', 'required_roles': ['anesthetist', 'anesthetist'], 'duration_slots': 1}]
+        result = scheduling_cpsat.schedule_surgeries_cpsat(staff, twice, ['08:00'])
+        assert sorted(result['op3']['roles']['anesthetist']) == ['s2', 's3']
+
+    def test_cpsat_infeasible_returns_none(self):
+        # presolve in some OR-Tools releases crashes on this infeasible instance
+        pytest.importorskip('ortools')
+        from modules import scheduling_cpsat
+        staff = [{'id': f's{i}', 'roles': ['nurse'], 'max_slots': m} for i, m in enumerate([5, 8, 3, 5])]
+        staff += [
+            {'id': 's4', 'roles': ['surgeon', 'anesthetist'], 'max_slots': 7},
+            {'id': 's5', 'roles': ['surgeon', 'anesthetist'], 'max_slots': 5},
+        ]
+        needs = [
+            (['anesthetist', 'nurse'], 2), (['surgeon'], 3), (['anesthetist'], 2), (['nurse', 'surgeon'], 1),
+            (['anesthetist'], 2), (['surgeon'], 3), (['surgeon'], 3), (['anesthetist', 'surgeon'], 1),
+        ]
+        surgeries = [{'id': f'op{i}', 'required_roles': roles, 'duration_slots': d}
+                     for i, (roles, d) in enumerate(needs)]
+        slots = ['08:00', '09:00', '10:00', '11:00']
+        assert scheduling_cpsat.schedule_surgeries_cpsat(staff, surgeries, slots) is None
+        assert scheduling_csp.schedule_surgeries(staff, surgeries, slots) is None
+
+    def test_cpsat_failure_falls_back_to_backtracker(self, monkeypatch):
+        pytest.importorskip('ortools')
+        from modules import scheduling_cpsat
+
+        def crash(*args, **kwargs):
+            raise scheduling_cpsat.CpSatError('boom')
+
+        monkeypatch.setattr(scheduling_cpsat, 'schedule_surgeries_cpsat', crash)
+        n = scheduling_csp.CPSAT_MIN_SURGERIES
+        staff = [{'id': f's{i}', 'roles': ['surgeon'], 'max_slots': 1} for i in range(n)]
+        surgeries = [{'id': f'op{i}', 'required_roles': ['surgeon'], 'duration_slots': 1} for i in range(n)]
+        result = scheduling_csp.schedule_surgeries(staff, surgeries, ['08:00'])
+        assert result is not None
+        assert len({a['roles']['surgeon'] for a in result.values()}) == n
+
+    def test_ac3_prunes_overlapping_starts(self):
+        # one surgeon, so op1 (3 slots) and op2 (2 slots) must not overlap
+        staff = [{'id': 's1', 'roles': ['surgeon'], 'max_slots': 10}]
+        surgeries = [
+            {'id': 'op1', 'required_roles': ['surgeon'], 'duration_slots': 3},
+            {'id': 'op2', 'required_roles': ['surgeon'], 'duration_slots': 2},
+        ]
+        duration = {'op1': 3, 'op2': 2}
+        domains = {'op1': {0, 1, 2}, 'op2': {0, 1, 2, 3}}
+        assert scheduling_csp._ac3(surgeries, staff, duration, domains)
+        assert domains == {'op1': {0, 2}, 'op2': {0, 3}}
+
 
 class TestExpertSystem:
     """Tests for rule-based expert system"""
@@ -115,6 +341,33 @@ class TestExpertSystem:
         assert es.query('diagnosis_x') == True
         assert es.query('diagnosis_y') == False
 
+    def test_incremental_inference(self):
+        rules = [
+            {'if': ['fever', 'cough'], 'then': ['possible_infection']},
+            {'if': ['possible_infection', 'high_wbc'], 'then': ['bacterial_infection']},
+        ]
+        es = expert_system.ExpertSystem(rules)
+        es.assert_fact('fever')
+        es.assert_fact('cough')
+        es.infer()
+        assert 'possible_infection' in es.facts
+        assert 'bacterial_infection' not in es.facts
+
+        # facts arriving after a previous infer() still chain correctly
+        es.assert_fact('high_wbc')
+        es.infer()
+        assert 'bacterial_infection' in es.facts
+        assert es.diagnoses() == ('bacterial_infection', 'cough', 'fever',
+                                  'high_wbc', 'possible_infection')
+    
+    def test_add_rule_invalidates_memo(self):
+        es = expert_system.ExpertSystem([{'if': ['fever'], 'then': ['possible_infection']}])
+        assert es.closure({'fever'}) == {'fever', 'possible_infection'}
+        es.add_rule({'if': ['possible_infection'], 'then': ['needs_test']})
+        assert 'needs_test' in es.closure({'fever'})
+        assert es.sorted_closure({'fever'}) == ('fever', 'needs_test', 'possible_infection')
+        assert es.facts == set()
+
 
 class TestFuzzyTriage:
     """Tests for fuzzy logic triage system"""
@@ -138,6 +391,38 @@ class TestFuzzyTriage:
         # Test handling of edge case
         priority = fuzzy_triage.compute_priority(37.0, 120, 0)
         assert priority >= 0  # Should not crash
+    
+    def test_memberships_match_fuzz_functions(self):
+        out = np.empty(9)
+        for temp, sbp, pain in [(39.0, 130, 8), (36.0, 100, 1), (37.2, 121, 5)]:
+            fuzzy_triage._memberships(temp, sbp, pain, out)
+            expected = [
+                *fuzzy_triage.fuzz_temp(temp).values(),
+                *fuzzy_triage.fuzz_bp(sbp).values(),
+                *fuzzy_triage.fuzz_pain(pain).values(),
+            ]
+            assert out == pytest.approx(expected)
+    
+    def test_batch_matches_scalar(self):
+        rng = np.random.default_rng(0)
+        temp = rng.uniform(34.0, 42.0, 200)
+        sbp = rng.uniform(70.0, 200.0, 200)
+        pain = rng.uniform(0.0, 10.0, 200)
+        batch = fuzzy_triage.compute_priority_batch(temp, sbp, pain)
+        scalar = [fuzzy_triage.compute_priority(t, b, p) for t, b, p in zip(temp, sbp, pain)]
+        assert batch == pytest.approx(scalar)
+
+    def test_scalar_kernel_matches_memberships(self, monkeypatch):
+        # the scalar kernel hard-codes the membership coefficients; check it
+        # against the NumPy path built on _memberships / _A.._D, on a grid
+        # through every breakpoint (numba is switched off for the batch)
+        monkeypatch.setattr(fuzzy_triage, '_numba', False)
+        temp, sbp, pain = np.meshgrid(np.arange(33.0, 42.01, 0.25), np.arange(60.0, 200.1, 5.0),
+                                      np.arange(0.0, 10.01, 0.5), indexing='ij')
+        batch = fuzzy_triage.compute_priority_batch(temp, sbp, pain).ravel()
+        scalar = [fuzzy_triage._compute_priority_scalar(t, b, p)
+                  for t, b, p in zip(temp.ravel(), sbp.ravel(), pain.ravel())]
+        assert batch == pytest.approx(scalar)
 
 
 class TestGeneticOptimizer:
@@ -170,6 +455,118 @@ class TestGeneticOptimizer:
         fitness = genetic_optimizer.fitness(chrom, patients, beds)
         assert isinstance(fitness, (int, float))
         assert fitness > 0  # Good allocation should have positive fitness
+    
+    def test_fitness_batch_matches_scalar(self):
+        patients = [
+            {'id': 'p1', 'needs_icu': True, 'needs_vent': True, 'location': (0, 0)},
+            {'id': 'p2', 'needs_icu': False, 'location': (5, 5)},
+            {'id': 'p3', 'needs_vent': True, 'location': (2, 7)},
+        ]
+        beds = [
+            {'id': 'b1', 'icu': True, 'vent': True, 'location': (1, 0)},
+            {'id': 'b2', 'icu': False, 'location': (6, 6)},
+        ]
+        pop = [[0, 1, -1], [1, 0, 0], [-1, -1, 1], [0, 0, 0]]
+        batch = genetic_optimizer.fitness_batch(pop, patients, beds)
+        assert batch.shape == (4,)
+        assert batch == pytest.approx([genetic_optimizer.fitness(c, patients, beds) for c in pop])
+
+        # fractional and out-of-int32 coordinates are not truncated
+        patients = [{'id': 'p1', 'location': (0.9, 0)}, {'id': 'p2', 'location': (2**40, 3)}]
+        beds = [{'id': 'b1', 'location': (0.4, 0)}, {'id': 'b2', 'location': (0.6, 2**35)}]
+        pop = [[0, 1], [1, 0], [-1, 0]]
+        batch = genetic_optimizer.fitness_batch(pop, patients, beds)
+        assert batch == pytest.approx([genetic_optimizer.fitness(c, patients, beds) for c in pop])
+    
+    def test_warm_start_keeps_best(self):
+        patients = [
+            {'id': 'p1', 'needs_icu': True, 'location': (0, 0)},
+            {'id': 'p2', 'needs_icu': False, 'location': (5, 5)},
+        ]
+        beds = [
+            {'id': 'b1', 'icu': True, 'location': (1, 0)},
+            {'id': 'b2', 'icu': False, 'location': (6, 6)},
+        ]
+        best, pop = genetic_optimizer.ga_evolve(patients, beds, pop_size=10, gens=3)
+        assert pop.shape == (10, 2)
+        assert list(pop[0]) == best
+        # elitism means a warm start can never do worse than its seed
+        seeded = genetic_optimizer.ga_optimize(patients, beds, pop_size=10, gens=2, warm_pop=[[0, 1]])
+        assert genetic_optimizer.fitness(seeded, patients, beds) >= genetic_optimizer.fitness([0, 1], patients, beds)
+
+
+@pytest.mark.skipif(not fastcore.FASTCORE_AVAILABLE, reason='fastcore extension not built')
+class TestFastcore:
+    """Parity of the compiled kernels with the NumPy implementations"""
+
+    def test_select_bed_matches_numpy(self, monkeypatch):
+        rng = np.random.default_rng(11)
+        for _ in range(200):
+            beds = [{'id': f'b{i}', 'is_occupied': bool(rng.random() < 0.3), 'icu': bool(rng.random() < 0.4),
+                     'vent': bool(rng.random() < 0.4), 'location': tuple(rng.integers(-50, 200, 2).tolist())}
+                    for i in range(int(rng.integers(1, 15)))]
+            patient = {'id': 'p', 'needs_icu': bool(rng.random() < 0.5), 'needs_vent': bool(rng.random() < 0.5),
+                       'location': tuple(rng.integers(-50, 200, 2).tolist())}
+            pool = bed_allocation.BedPool.from_dicts(beds)
+            compiled = pool.select(patient)
+            monkeypatch.setattr(fastcore, 'FASTCORE_AVAILABLE', False)
+            assert compiled == pool.select(patient)
+            monkeypatch.undo()
+
+    def test_fitness_batch_matches_numpy(self):
+        rng = np.random.default_rng(12)
+        for _ in range(50):
+            n, m = int(rng.integers(1, 8)), int(rng.integers(1, 8))
+            pat_xy = rng.integers(-50, 200, (n, 2)).astype(np.int32)
+            bed_xy = rng.integers(-50, 200, (m, 2)).astype(np.int32)
+            pat_icu, pat_vent = rng.random(n) < 0.5, rng.random(n) < 0.5
+            bed_icu, bed_vent = rng.random(m) < 0.5, rng.random(m) < 0.5
+            P = rng.integers(-1, m + 1, (20, n)).astype(np.int16)
+            expected = genetic_optimizer._fitness_vec(P, pat_icu, pat_vent, bed_icu, bed_vent,
+                                                      geometry.pairwise_manhattan(pat_xy, bed_xy))
+            got = fastcore.fitness_batch(P, pat_icu, pat_vent, pat_xy, bed_icu, bed_vent, bed_xy)
+            assert got == pytest.approx(expected)
+
+
+class TestNumbaKernels:
+    """Parity of the optional Numba kernels with the NumPy ones"""
+
+    def test_ga_operators_match_numpy(self):
+        pytest.importorskip('numba')
+        from modules import genetic_optimizer_numba as nb
+        rng = np.random.default_rng(21)
+        for _ in range(20):
+            rows_, n, m = int(rng.integers(2, 40)), int(rng.integers(1, 12)), int(rng.integers(1, 10))
+            pop = rng.integers(-1, m, size=(rows_, n)).astype(np.int16)
+            children = int(rng.integers(1, 30))
+            pairs = rng.integers(0, rows_, size=(2, children))
+            cuts = rng.integers(1, max(n, 2), size=children)
+            expected = np.empty((children, n), dtype=pop.dtype)
+            got = np.empty_like(expected)
+            genetic_optimizer._crossover_kernel(pop, pairs, cuts, expected)
+            nb.crossover_kernel(pop, pairs, cuts, got)
+            assert (got == expected).all()
+
+            rows = np.flatnonzero(rng.random(children) < 0.5)
+            cols = rng.integers(0, n, size=len(rows))
+            vals = rng.integers(-1, m, size=len(rows)).astype(pop.dtype)
+            genetic_optimizer._mutate_kernel(expected, rows, cols, vals)
+            nb.mutate_kernel(got, rows, cols, vals)
+            assert (got == expected).all()
+
+    def test_fuzzy_kernels_match_numpy(self, monkeypatch):
+        pytest.importorskip('numba')
+        from modules import fuzzy_triage_numba as nb
+        rng = np.random.default_rng(22)
+        temp = rng.uniform(34, 42, 2000)
+        sbp = rng.uniform(70, 200, 2000)
+        pain = rng.uniform(0, 10, 2000)
+        monkeypatch.setattr(fuzzy_triage, '_numba', False)
+        expected = fuzzy_triage.compute_priority_batch(temp, sbp, pain)
+        # fastmath may reassociate the defuzzification sums
+        assert nb.priority_batch(temp, sbp, pain) == pytest.approx(expected, abs=1e-9)
+        scalar = [nb.priority_scalar(t, s, p) for t, s, p in zip(temp[:200], sbp[:200], pain[:200])]
+        assert scalar == pytest.approx(expected[:200].tolist(), abs=1e-9)
 
 
 class TestNLPChatbot:
@@ -190,6 +587,153 @@ class TestNLPChatbot:
     def test_unknown_query_fallback(self):
         response = nlp_chatbot.respond('Random gibberish xyz123')
         assert 'help' in response.lower() or 'ask' in response.lower()
+    
+    def test_keywords_match_whole_words(self):
+        # "hi" inside "this"/"high" is not a greeting
+        assert nlp_chatbot.respond('this is high') == nlp_chatbot.FALLBACK
+
+    @pytest.mark.skipif(not nlp_chatbot._HYPERSCAN_AVAILABLE, reason="hyperscan not installed")
+    def test_hyperscan_matches_re_path(self):
+        messages = ['Hi there', 'this is high', 'I need to SCHEDULE', 'fever, then hello',
+                    'éhi there', 'ßhey', 'Hİ', 'ſchedule please', 'température', '']
+        for msg in messages:
+            m = nlp_chatbot.INTENT_RE.search(msg)
+            assert nlp_chatbot._hyperscan_intent(msg) == (m.lastgroup if m else None), msg
+
+    @pytest.mark.skipif(not nlp_chatbot._HYPERSCAN_AVAILABLE, reason="hyperscan not installed")
+    def test_hyperscan_concurrent_scans(self):
+        from concurrent.futures import ThreadPoolExecutor
+        message = 'nothing to see here ' * 50 + 'hi'
+
+        def burst(_):
+            return {nlp_chatbot.respond(message) for _ in range(300)}
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            replies = set().union(*pool.map(burst, range(8)))
+        assert replies == {nlp_chatbot.RESPONSES['greet']}
+
+
+class TestHospitalAgent:
+    """Tests for the PEAS agent's perception"""
+
+    beds = [{'id': 'b1', 'is_occupied': False, 'icu': False, 'vent': False, 'location': (0, 0)}]
+
+    def test_add_rule_reaches_repeat_patients(self):
+        agent = HospitalAgent(self.beds, [], [{'if': ['fever'], 'then': ['infection']}])
+        patient = {'id': 'p1', 'temp': 38.5, 'symptoms': ['fever']}
+        assert agent.perceive(patient)['diagnosis'] == ('fever', 'infection')
+        agent.expert_system.add_rule({'if': ['infection'], 'then': ['needs_antibiotics']})
+        assert agent.perceive(patient)['diagnosis'] == ('fever', 'infection', 'needs_antibiotics')
+
+    def test_diagnoses_do_not_leak_between_patients(self):
+        agent = HospitalAgent(self.beds, [], [{'if': ['fever', 'cough'], 'then': ['possible_infection']}])
+        a = agent.perceive({'id': 'A', 'temp': 39.0, 'symptoms': ['fever', 'cough']})
+        b = agent.perceive({'id': 'B', 'symptoms': []})
+        assert a['diagnosis'] == ('cough', 'fever', 'possible_infection')
+        assert b['diagnosis'] == ()
+        assert agent.expert_system.facts == set()
+
+    def test_repeat_presentation_hits_cache(self):
+        agent = HospitalAgent(self.beds, [], [{'if': ['fever'], 'then': ['infection']}])
+        patient = {'id': 'p1', 'temp': 38.5, 'sbp': 110, 'pain': 4, 'symptoms': ['fever']}
+        first = agent.perceive(patient)
+        again = agent.perceive(dict(patient, id='p2', symptoms=['fever', 'fever']))
+        assert again['priority'] == first['priority']
+        assert again['diagnosis'] == first['diagnosis']
+        assert agent._priority_cached.cache_info().hits == 1
+        assert agent.expert_system._sorted_closure.cache_info().hits == 1
+        assert again['diagnosis'] is first['diagnosis']
+
+    def test_queue_orders_by_priority_then_arrival(self):
+        agent = HospitalAgent(self.beds, [], [])
+        entries = []
+        for pid, priority in [('a', 40.0), ('b', 70.0), ('c', 40.0), ('d', 90.0), ('e', 70.0)]:
+            entry = (-priority, agent._counter, {'patient_id': pid, 'priority': priority})
+            agent._pq.append(entry)
+            agent._counter += 1
+            entries.append(entry)
+        agent._pq.sort()
+        assert [p['patient_id'] for p in agent.ordered_queue()] == ['d', 'b', 'e', 'a', 'c']
+        assert agent.patients_queue == agent.ordered_queue()
+        assert [agent.queue_position(e) for e in entries] == [3, 1, 4, 0, 2]
+
+        # decide() queues through the same heap
+        decision = agent.decide({'patient_id': 'f', 'priority': 70.0, 'diagnosis': (),
+                                 'needs_icu': False, 'needs_vent': False, 'location': (0, 0)})
+        assert decision['queue_position'] == 3
+        assert [p['patient_id'] for p in agent.ordered_queue()] == ['d', 'b', 'e', 'f', 'a', 'c']
+
+    def test_act_resolves_beds_without_index(self):
+        beds = [{'id': 'b1', 'is_occupied': False, 'icu': False, 'vent': False, 'location': (0, 0)},
+                {'id': 'b2', 'is_occupied': False, 'icu': False, 'vent': False, 'location': (1, 0)}]
+        agent = HospitalAgent(beds, [], [])
+        base = {'patient_id': 'p1', 'priority': 50.0, 'diagnosis': (), 'queue_position': 0}
+
+        # a copy of the bed dict is matched by id
+        report = agent.act(dict(base, allocated_bed=dict(beds[1])))
+        assert report.startswith('Allocated bed b2')
+        assert agent.allocated_beds['p1'] is beds[1]
+        assert agent.bed_pool.occupied.tolist() == [False, True]
+
+        # an unknown bed is reported as no bed instead of raising
+        report = agent.act(dict(base, patient_id='p2', allocated_bed={'id': 'elsewhere'}))
+        assert report == 'No bed available. Queue position: 0'
+        assert 'p2' not in agent.allocated_beds
+        assert agent.bed_pool.occupied.tolist() == [False, True]
+
+    def test_warm_population_follows_patient_ids(self):
+        beds = [{'id': f'b{i}', 'is_occupied': False, 'icu': i % 2 == 0, 'vent': False, 'location': (i, 0)}
+                for i in range(4)]
+        agent = HospitalAgent(beds, [], [])
+        first = [agent.perceive({'id': f'p{i}', 'location': (i, 0)}) for i in range(3)]
+        agent._optimize_queue(first)
+        prev_pop = agent._ga_pop.copy()
+
+        # p0 leaves, p2 comes back as a fresh perception dict, p9 is new
+        newcomer = agent.perceive({'id': 'p9', 'needs_icu': True, 'location': (3, 0)})
+        later = [agent.perceive({'id': 'p2', 'location': (2, 0)}), first[1], newcomer]
+        warm = agent._warm_population(later)
+        assert warm.shape == (len(prev_pop), 3)
+        assert ((warm >= -1) & (warm < len(beds))).all()
+        assert (warm[:, 0] == prev_pop[:, 2]).all()
+        assert (warm[:, 1] == prev_pop[:, 1]).all()
+        assert warm[0, 2] == agent.bed_pool.select(newcomer)
+
+        agent._optimize_queue(later)
+        assert agent._warm_population([agent.perceive({'id': 'p0', 'location': (0, 0)})]) is None
+
+    def test_decide_batch_matches_decide(self):
+        beds = [
+            {'id': 'b1', 'is_occupied': False, 'icu': True, 'vent': False, 'location': (0, 0)},
+            {'id': 'b2', 'is_occupied': False, 'icu': False, 'vent': False, 'location': (5, 5)},
+            {'id': 'b3', 'is_occupied': False, 'icu': False, 'vent': False, 'location': (1, 1)},
+        ]
+        patients = [
+            {'id': 'p1', 'temp': 39.5, 'pain': 8, 'needs_icu': True, 'location': (0, 0)},
+            {'id': 'p2', 'temp': 37.0, 'location': (1, 1)},
+            {'id': 'p3', 'temp': 38.0, 'pain': 5, 'location': (6, 6)},
+        ]
+        single = HospitalAgent([dict(b) for b in beds], [], [])
+        batch = HospitalAgent([dict(b) for b in beds], [], [])
+
+        def compare(arrivals, expect_beds):
+            one = [single.decide(single.perceive(p)) for p in arrivals]
+            many = batch.decide_batch([batch.perceive(p) for p in arrivals])
+            assert one == many
+            assert [d['allocated_bed'] and d['allocated_bed']['id'] for d in many] == expect_beds
+            return many
+
+        for agent in (single, batch):
+            agent.act({'allocated_bed': agent.beds[2], 'bed_index': 2, 'priority': 0.0, 'diagnosis': ()})
+        # decisions never occupy beds, so p1 and p2 both get b1
+        compare(patients, ['b1', 'b1', 'b2'])
+        for agent in (single, batch):
+            for i in (0, 1):
+                agent.act({'allocated_bed': agent.beds[i], 'bed_index': i, 'priority': 0.0, 'diagnosis': ()})
+        # five queued patients in all, so the GA never runs
+        decisions = compare(patients[:2], [None, None])
+        assert [d['bed_index'] for d in decisions] == [-1, -1]
+        assert [d['queue_position'] for d in decisions] == [1, 4]
 
 
 class TestIntegration:
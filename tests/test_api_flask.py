@@ -0,0 +1,42 @@
+import pytest
+
+pytest.importorskip('flask')
+from app import api_flask
+
+BEDS = [
+    {'id': 'b1', 'is_occupied': False, 'icu': False, 'vent': False, 'location': [9, 9], 'ward': 'A'},
+    {'id': 'b2', 'is_occupied': False, 'icu': True, 'vent': False, 'location': [1, 0], 'ward': 'ICU'},
+]
+PATIENT = {'id': 'p1', 'needs_icu': True, 'needs_vent': False, 'location': [0, 0]}
+
+
+@pytest.fixture
+def client():
+    api_flask._bed_pool.cache_clear()
+    return api_flask.app.test_client()
+
+
+def test_missing_body_is_bad_request(client):
+    for route in ('/allocate', '/priority', '/chat'):
+        assert client.post(route).status_code == 400
+        assert client.post(route, data='not json', content_type='application/json').status_code == 400
+
+
+def test_missing_field_is_bad_request(client):
+    assert client.post('/allocate', json={'patient': PATIENT}).status_code == 400
+    assert client.post('/priority', json={'temp': 38.0, 'sbp': 120}).status_code == 400
+
+
+def test_repeat_allocate_reuses_bed_pool(client):
+    first = client.post('/allocate', json={'patient': PATIENT, 'beds': BEDS})
+    second = client.post('/allocate', json={'patient': PATIENT, 'beds': BEDS})
+    assert first.status_code == second.status_code == 200
+    assert first.get_json() == second.get_json()
+    info = api_flask._bed_pool.cache_info()
+    assert (info.misses, info.hits) == (1, 1)
+
+
+def test_allocate_returns_callers_bed_dict(client):
+    resp = client.post('/allocate', json={'patient': PATIENT, 'beds': BEDS})
+    # extra keys survive: the answer is the request's own bed, not the pooled copy
+    assert resp.get_json() == {'bed': BEDS[1]}
@@ -1,5 +1,7 @@
 import os
+import re
 import pandas as pd
+import pytest
 import numpy as np
 from scripts.generate_patients import generate_n, save
 import tempfile
@@ -19,6 +21,8 @@ def test_no_nulls_for_required_fields():
         assert col in df.columns
         # ensure no nulls
         assert df[col].isnull().sum() == 0
+    assert df["age"].dtype == np.int8
+    assert df["bp_systolic"].dtype == np.int16
 
 def test_age_distribution_stats():
     df = generate_n(n=5000, seed=11)
@@ -43,3 +47,83 @@ def test_reproducibility():
     d1 = generate_n(n=200, seed=500)
     d2 = generate_n(n=200, seed=500)
     pd.testing.assert_frame_equal(d1.reset_index(drop=True), d2.reset_index(drop=True))
+
+def test_workers_do_not_change_output(monkeypatch):
+    import scripts.generate_patients as gp
+    monkeypatch.setattr(gp, "SHARD_SIZE", 40)
+    monkeypatch.setattr(gp, "PARALLEL_MIN_N", 100)
+    d1 = gp.generate_n(n=150, seed=3, workers=1)
+    d2 = gp.generate_n(n=150, seed=3, workers=2)
+    assert len(d1) == 150
+    pd.testing.assert_frame_equal(d1, d2)
+
+def test_low_cardinality_columns_are_categorical(monkeypatch):
+    import scripts.generate_patients as gp
+    monkeypatch.setattr(gp, "SHARD_SIZE", 40)
+    df = gp.generate_n(n=120, seed=8)
+    for col in ["gender", "blood_type", "admission_type", "chief_complaint", "diagnosis_icd10"]:
+        assert isinstance(df[col].dtype, pd.CategoricalDtype), col
+    assert set(df["chief_complaint"]) <= set(df["chief_complaint"].cat.categories)
+
+def test_medications_mask_decodes_to_medications():
+    from scripts.generate_patients import decode_meds
+    df = generate_n(n=300, seed=21)
+    assert df["medications_mask"].dtype == np.uint8
+    assert (decode_meds(df["medications_mask"].to_numpy()) == df["medications"].to_numpy()).all()
+    # at most two distinct medications per patient
+    assert max(bin(m).count("1") for m in df["medications_mask"]) <= 2
+
+def test_json_keeps_one_decimal_measurements(tmp_path):
+    import json
+    from scripts.generate_patients import generate_one
+    df = generate_n(n=200, seed=13)
+    out = tmp_path / "out.json"
+    save(df, str(out), fmt="json")
+    records = json.loads(out.read_text())
+    for col in ["temperature", "spo2", "weight_kg", "bmi"]:
+        values = [r[col] for r in records]
+        assert values == [round(v, 1) for v in values], col
+        assert values == df[col].tolist(), col
+    record = generate_one(seed_for_record=5)
+    assert record["temperature"] == round(record["temperature"], 1)
+    assert re.fullmatch(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}", records[0]["admission_datetime"])
+    assert re.fullmatch(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}", record["discharge_datetime"])
+
+@pytest.mark.parametrize("use_pyarrow", [True, False])
+def test_csv_round_trip(tmp_path, monkeypatch, use_pyarrow):
+    import scripts.generate_patients as gp
+    if use_pyarrow:
+        pytest.importorskip("pyarrow")
+    monkeypatch.setattr(gp, "_PYARROW_AVAILABLE", use_pyarrow)
+    df = generate_n(n=60, seed=17)
+    out = tmp_path / "out.csv"
+    save(df, str(out), fmt="csv")
+    back = pd.read_csv(out, parse_dates=["admission_datetime", "discharge_datetime"], keep_default_na=False)
+    assert list(back.columns) == list(df.columns)
+    for col in ["patient_id", "gender", "medications", "notes"]:
+        assert back[col].tolist() == df[col].astype(str).tolist(), col
+    for col in ["age", "temperature", "bmi", "medications_mask"]:
+        assert back[col].tolist() == df[col].tolist(), col
+    assert (back["admission_datetime"] == df["admission_datetime"]).all()
+
+def test_csv_writers_are_byte_identical(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    import scripts.generate_patients as gp
+    df = generate_n(n=300, seed=23)
+    df.loc[0, "notes"] = 'Said "fine, thanks"'  # needs quoting: pandas writes it
+    for frame, name in ((df.iloc[1:], "plain"), (df, "quoted")):
+        monkeypatch.setattr(gp, "_PYARROW_AVAILABLE", True)
+        save(frame, str(tmp_path / f"{name}_arrow.csv"), fmt="csv")
+        monkeypatch.setattr(gp, "_PYARROW_AVAILABLE", False)
+        save(frame, str(tmp_path / f"{name}_pandas.csv"), fmt="csv")
+        arrow = (tmp_path / f"{name}_arrow.csv").read_bytes()
+        assert arrow == (tmp_path / f"{name}_pandas.csv").read_bytes(), name
+
+def test_parquet_round_trip(tmp_path):
+    pytest.importorskip("pyarrow")
+    df = generate_n(n=60, seed=17)
+    out = tmp_path / "out.parquet"
+    save(df, str(out), fmt="parquet")
+    # Parquet has no seconds unit, so timestamps come back as ms
+    pd.testing.assert_frame_equal(pd.read_parquet(out), df, check_dtype=False)
+    assert isinstance(pd.read_parquet(out)["gender"].dtype, pd.CategoricalDtype)
@@ -3,12 +3,15 @@ import importlib
 modules = [
     'modules.bed_allocation',
     'modules.scheduling_csp',
+    'modules.scheduling_cpsat',
     'modules.expert_system',
     'modules.fuzzy_triage',
     'modules.genetic_optimizer',
     'modules.ml_predictor',
     'modules.nn_classifier',
     'modules.nlp_chatbot',
+    'modules.geometry',
+    'modules.soa',
 ]
 
 
@@ -16,3 +19,54 @@ def test_imports():
     for m in modules:
         mod = importlib.import_module(m)
         assert mod is not None
+
+
+def test_run_demo_sections(capsys):
+    import argparse
+    import pytest
+    import run_demo
+
+    assert run_demo._section_list('bed,triage') == ['bed', 'triage']
+    with pytest.raises(argparse.ArgumentTypeError, match='unknown section'):
+        run_demo._section_list('bed,surgery')
+
+    run_demo.demo(only=['triage', 'expert'], skip=['expert'])
+    out = capsys.readouterr().out
+    assert 'Patient Triage' in out
+    assert 'Expert System' not in out and 'Bed Allocation' not in out
+    assert f'1 of {len(run_demo.SECTIONS)} AI modules' in out
+
+    run_demo.demo(skip=[name for name in run_demo.SECTIONS if name != 'bed'])
+    assert 'Bed Allocation' in capsys.readouterr().out
+
+
+def test_run_demo_cli_is_lazy():
+    import os
+    import subprocess
+    import sys
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    # skipped sections and `import modules` itself must not pull in scikit-learn
+    code = ("import runpy, sys; sys.argv = ['run_demo.py', '--only', 'triage']; "
+            "runpy.run_path('run_demo.py', run_name='__main__'); "
+            "assert 'sklearn' not in sys.modules and 'modules.ml_predictor' not in sys.modules")
+    ok = subprocess.run([sys.executable, '-c', code], cwd=root, capture_output=True, text=True)
+    assert ok.returncode == 0, ok.stderr
+    bad = subprocess.run([sys.executable, 'run_demo.py', '--skip', 'nope'], cwd=root,
+                         capture_output=True, text=True)
+    assert bad.returncode == 2
+    assert 'unknown section(s): nope' in bad.stderr
+
+
+def test_sample_datasets_are_cached_read_only():
+    import pytest
+    from modules import ml_predictor, nn_classifier
+
+    for make in (ml_predictor.make_sample_dataset, nn_classifier.make_sample_data):
+        X, y = make()
+        again = make()
+        assert again[0] is X and again[1] is y
+        for arr in (X, y):
+            assert not arr.flags.writeable
+            with pytest.raises(ValueError):
+                arr[0] = arr[0]